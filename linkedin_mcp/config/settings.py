@@ -1,5 +1,6 @@
 """MCP LinkedIn server configuration."""
 import os
+from typing import Dict, Literal
 
 from dotenv import load_dotenv
 from pydantic import HttpUrl, SecretStr, Field
@@ -36,6 +37,10 @@ class Settings(BaseSettings):
         default="https://api.linkedin.com/v2/assets?action=registerUpload",
         description="LinkedIn asset registration endpoint"
     )
+    LINKEDIN_ASSETS_URL: HttpUrl = Field(
+        default="https://api.linkedin.com/v2/assets",
+        description="LinkedIn asset status endpoint"
+    )
 
     # OAuth Scopes
     LINKEDIN_SCOPES: list[str] = [
@@ -49,9 +54,69 @@ class Settings(BaseSettings):
     LINKEDIN_VERSION: str = "202210"  # LinkedIn API version
     RESTLI_PROTOCOL_VERSION: str = "2.0.0"  # Rest.li protocol version
 
+    # HTTP Connection Settings
+    HTTP_MAX_CONNECTIONS: int = Field(default=100, ge=1, description="Pooled connections to LinkedIn")
+    HTTP_KEEPALIVE_EXPIRY: float = 90.0  # Seconds an idle pooled connection is kept
+    HTTP_PREWARM: bool = False  # Open connections to the LinkedIn endpoints at startup
+    HTTP_PREWARM_CONNECTIONS: int = Field(default=2, ge=1, description="Warm connections kept per origin")
+    HTTP_KEEPALIVE_INTERVAL: float = Field(default=30.0, gt=0, description="Seconds between keep-alive pings")
+
+    # Adaptive Concurrency Settings (AIMD on latency and 429/5xx responses)
+    ADAPTIVE_LIMIT_INITIAL: int = Field(default=10, ge=1, description="Concurrent API calls before any feedback")
+    ADAPTIVE_LIMIT_MIN: int = Field(default=1, ge=1)
+    ADAPTIVE_LIMIT_MAX: int = Field(default=100, ge=1)
+    ADAPTIVE_LIMIT_BACKOFF: float = Field(default=0.7, gt=0, lt=1, description="Limit factor on congestion")
+    ADAPTIVE_LIMIT_LATENCY_TOLERANCE: float = Field(
+        default=2.0, gt=1, description="Short/long-term latency ratio treated as congestion"
+    )
+    SCHEDULER_STARVATION_TIMEOUT: float = Field(
+        default=5.0, gt=0, description="Seconds before a queued background request is served ahead of interactive ones"
+    )
+
+    # Media Upload Settings
+    UPLOAD_CHUNK_SIZE: int = Field(default=1024 * 1024, gt=0, description="Bytes read and sent per upload chunk")
+    UPLOAD_MAX_INFLIGHT_BYTES: int = Field(
+        default=256 * 1024 * 1024, gt=0,
+        description="Total size of media uploads in flight at once (a larger file runs alone)"
+    )
+    UPLOAD_MAX_CONNECTIONS: int = Field(default=4, ge=1, description="Media uploads in flight at once")
+    UPLOAD_STARVATION_TIMEOUT: float = 30.0  # Seconds before smaller uploads may no longer pass a queued one
+    ASSET_READY_TIMEOUT: float = Field(default=300.0, gt=0, description="Seconds to wait for media processing")
+    ASSET_POLL_INITIAL_INTERVAL: float = Field(default=1.0, gt=0, description="Seconds between first status checks")
+    ASSET_POLL_MAX_INTERVAL: float = Field(default=15.0, gt=0, description="Longest backed-off status check interval")
+    ASSET_POLL_BATCH_SIZE: int = Field(default=20, ge=1, description="Assets checked per status request")
+    ASSET_CACHE_TTL: float = Field(default=86400.0, gt=0, description="Seconds uploaded media handles stay usable")
+
+    # Daily API Quotas (by endpoint name, "*" for all endpoints; LinkedIn resets them at midnight UTC)
+    QUOTA_APP_DAILY_LIMITS: Dict[str, int] = Field(
+        default={"ugcPosts": 100000}, description="Calls per day for the whole app"
+    )
+    QUOTA_MEMBER_DAILY_LIMITS: Dict[str, int] = Field(
+        default={"ugcPosts": 150}, description="Calls per day for each member"
+    )
+    QUOTA_MAX_DEFER: float = Field(
+        default=60.0, ge=0, description="Seconds background calls wait out a throttled endpoint instead of failing"
+    )
+
     # Token Storage Settings
     TOKEN_STORAGE_PATH: str = os.path.join("linkedin_mcp", "tokens")
 
+    # Shared state (tokens, asset cache, rate limits) for all worker processes
+    STATE_DB_PATH: str = os.path.join("linkedin_mcp", "state.db")
+    STATE_PURGE_INTERVAL: float = Field(default=3600.0, gt=0, description="Seconds between removals of expired state")
+
+    # MCP Transport Settings
+    MCP_TRANSPORT: Literal["stdio", "sse", "streamable-http"] = "stdio"
+    MCP_HOST: str = "127.0.0.1"
+    MCP_PORT: int = 8000
+    MCP_WORKERS: int = Field(default=1, ge=1, description="Worker processes for the streamable-http transport")
+    MCP_SHUTDOWN_TIMEOUT: float = 30.0  # Seconds to let in-flight requests finish on shutdown
+
+    # Event Loop Monitoring
+    LOOP_MONITOR: bool = False  # Log callbacks that block the event loop and count them per tool
+    LOOP_BLOCK_THRESHOLD: float = Field(default=0.1, gt=0, description="Seconds a callback may block the loop")
+    LOOP_MONITOR_ASYNCIO_DEBUG: bool = False  # Also run asyncio in debug mode (slow, for development)
+
     # Logging Configuration
     LOG_LEVEL: str = "INFO"
 
@@ -0,0 +1,245 @@
+"""LinkedIn media asset readiness polling."""
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from ..config.settings import settings
+from ..linkedin.client import send
+from ..utils.quota import QuotaExceededError
+from ..utils.request_scheduler import Priority, current_priority, request_priority
+
+logger = logging.getLogger(__name__)
+
+# Recipe statuses meaning LinkedIn will never make the asset available
+FAILED_STATUSES = {"PROCESSING_FAILED", "CLIENT_ERROR"}
+
+
+class AssetProcessingError(Exception):
+    """Raised when an uploaded asset fails processing or isn't ready in time."""
+    pass
+
+
+def asset_id_from_urn(asset_urn: str) -> str:
+    """Get the asset ID from an asset URN such as urn:li:digitalmediaAsset:C5522AQ..."""
+    return asset_urn.rsplit(":", 1)[-1]
+
+
+def _is_permanent_error(status: Optional[int]) -> bool:
+    """Check if an HTTP status means retrying won't help (a 4xx other than 429)."""
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+class _PendingAsset:
+    """An asset being polled and the futures of everyone waiting for it."""
+
+    def __init__(self, asset_urn: str, interval: float) -> None:
+        self.asset_urn = asset_urn
+        self.interval = interval
+        self.next_check = time.monotonic()
+        self.waiters = 0
+        # Most urgent priority of the callers waiting for the asset
+        self.priority = Priority.MAINTENANCE
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class AssetReadinessPoller:
+    """Wait for uploaded assets to finish processing, checking them in batches.
+
+    Assets waited on by any caller are polled by one background loop. Each
+    round fetches the status of every asset that is due in a single batch
+    request, and each asset's polling interval backs off exponentially until
+    it becomes available, fails or nobody waits for it any more.
+    """
+
+    def __init__(
+            self,
+            headers: Callable[[], dict],
+            member: Callable[[], Optional[str]] = lambda: None,
+            initial_interval: float = 1.0,
+            max_interval: float = 15.0,
+            batch_size: int = 20
+    ) -> None:
+        """Initialize the poller.
+
+        Args:
+            headers: Returns the request headers including the current access token
+            member: Returns the member the status requests count against in the daily quotas
+            initial_interval: Seconds between the first status checks of an asset
+            max_interval: Upper bound for the backed-off interval
+            batch_size: Most assets checked with one request
+        """
+        self.headers = headers
+        self.member = member
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.batch_size = batch_size
+        self._pending: Dict[str, _PendingAsset] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    async def wait_until_available(self, asset_urns: List[str], timeout: float) -> None:
+        """Wait until every asset is available.
+
+        Args:
+            asset_urns: Asset URNs returned by the upload registration
+            timeout: Seconds to wait for all of them
+
+        Raises:
+            AssetProcessingError: If an asset fails processing or the deadline passes
+        """
+        entries = [self._watch(urn) for urn in dict.fromkeys(asset_urns)]
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(asyncio.shield(entry.future) for entry in entries)),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            pending = [entry.asset_urn for entry in entries if not entry.future.done()]
+            raise AssetProcessingError(f"Media not ready after {timeout:g}s: {', '.join(pending)}")
+        finally:
+            for entry in entries:
+                self._unwatch(entry)
+
+    def _watch(self, asset_urn: str) -> _PendingAsset:
+        """Register interest in an asset and make sure the poll loop runs."""
+        entry = self._pending.get(asset_urn)
+        if entry is None:
+            entry = self._pending[asset_urn] = _PendingAsset(asset_urn, self.initial_interval)
+        entry.waiters += 1
+        entry.priority = min(entry.priority, current_priority())
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+        return entry
+
+    def _unwatch(self, entry: _PendingAsset) -> None:
+        """Drop interest in an asset; it stops being polled once nobody waits."""
+        entry.waiters -= 1
+        if entry.waiters == 0 and self._pending.get(entry.asset_urn) is entry:
+            del self._pending[entry.asset_urn]
+        if not entry.future.done() and entry.waiters == 0:
+            entry.future.cancel()
+
+    async def _run(self) -> None:
+        """Poll due assets in batches until nothing is pending."""
+        while self._pending:
+            now = time.monotonic()
+            due = [entry for entry in self._pending.values() if entry.next_check <= now]
+            for start in range(0, len(due), self.batch_size):
+                await self._check(due[start:start + self.batch_size])
+            if not self._pending:
+                break
+            delay = min(entry.next_check for entry in self._pending.values()) - time.monotonic()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _check(self, batch: List[_PendingAsset]) -> None:
+        """Fetch the status of a batch of assets and settle the finished ones.
+
+        The request is sent at the most urgent priority of anyone waiting for
+        an asset in the batch.
+        """
+        try:
+            with request_priority(min(entry.priority for entry in batch)):
+                statuses, errors = await self._fetch_statuses([entry.asset_urn for entry in batch])
+        except QuotaExceededError as e:
+            self._fail(batch, AssetProcessingError(f"Can't check media status: {str(e)}"))
+            return
+        except httpx.HTTPStatusError as e:
+            if _is_permanent_error(e.response.status_code):
+                error_msg = f"Can't check media status: HTTP {e.response.status_code} from {e.request.url}"
+                logger.error(error_msg)
+                self._fail(batch, AssetProcessingError(error_msg))
+                return
+            logger.warning(f"Asset status check failed, retrying: {str(e)}")
+            statuses, errors = {}, {}
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            logger.warning(f"Asset status check failed, retrying: {str(e)}")
+            statuses, errors = {}, {}
+        except Exception as e:
+            # Fail the waiters right away rather than leaving them to time out
+            logger.exception("Asset status check failed")
+            self._fail(batch, e)
+            return
+
+        for entry in batch:
+            status = statuses.get(entry.asset_urn)
+            if entry.future.done():
+                continue
+            if entry.asset_urn in errors:
+                error_msg = f"Can't check media status of {entry.asset_urn}: {errors[entry.asset_urn]}"
+                logger.error(error_msg)
+                entry.future.set_exception(AssetProcessingError(error_msg))
+            elif status == "AVAILABLE":
+                logger.info(f"Asset available: {entry.asset_urn}")
+                entry.future.set_result(None)
+            elif status in FAILED_STATUSES:
+                entry.future.set_exception(AssetProcessingError(f"Media processing failed ({status}): {entry.asset_urn}"))
+            else:
+                logger.debug(f"Asset {entry.asset_urn} status {status or 'unknown'}, next check in {entry.interval:.1f}s")
+                entry.next_check = time.monotonic() + entry.interval
+                entry.interval = min(entry.interval * 2, self.max_interval)
+            if entry.future.done() and self._pending.get(entry.asset_urn) is entry:
+                del self._pending[entry.asset_urn]
+
+    def _fail(self, batch: List[_PendingAsset], error: Exception) -> None:
+        """Settle every waiter of a batch with an error and stop polling its assets."""
+        for entry in batch:
+            if not entry.future.done():
+                entry.future.set_exception(error)
+            if self._pending.get(entry.asset_urn) is entry:
+                del self._pending[entry.asset_urn]
+
+    async def _fetch_statuses(self, asset_urns: List[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Get the overall status of each asset.
+
+        An asset counts as AVAILABLE once all its recipes are, as failed if any
+        recipe failed, and otherwise reports the first pending recipe status.
+
+        Returns:
+            Statuses by asset URN, and error messages by asset URN for assets
+            the batch response reported a permanent error for
+        """
+        ids = {asset_id_from_urn(urn): urn for urn in asset_urns}
+        if len(ids) == 1:
+            asset_id = next(iter(ids))
+            response = await send(
+                "GET", f"{settings.LINKEDIN_ASSETS_URL}/{asset_id}",
+                endpoint="assets", member=self.member(), headers=self.headers()
+            )
+            response.raise_for_status()
+            results = {asset_id: response.json()}
+            errors = {}
+        else:
+            response = await send(
+                "GET", f"{settings.LINKEDIN_ASSETS_URL}?ids=List({','.join(ids)})",
+                endpoint="assets", member=self.member(), headers=self.headers()
+            )
+            response.raise_for_status()
+            data = response.json()
+            results = data.get("results", {})
+            errors = {
+                ids.get(asset_id, asset_id): f"HTTP {error.get('status')} {error.get('message', '')}".strip()
+                for asset_id, error in data.get("errors", {}).items()
+                if _is_permanent_error(error.get("status"))
+            }
+
+        statuses = {}
+        for asset_id, asset in results.items():
+            recipe_statuses = [recipe.get("status") for recipe in asset.get("recipes", [])]
+            if not recipe_statuses:
+                continue
+            failed = [status for status in recipe_statuses if status in FAILED_STATUSES]
+            if failed:
+                statuses[ids.get(asset_id, asset_id)] = failed[0]
+            elif all(status == "AVAILABLE" for status in recipe_statuses):
+                statuses[ids.get(asset_id, asset_id)] = "AVAILABLE"
+            else:
+                statuses[ids.get(asset_id, asset_id)] = next(s for s in recipe_statuses if s != "AVAILABLE")
+        return statuses, errors
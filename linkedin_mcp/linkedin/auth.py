@@ -1,13 +1,18 @@
 """LinkedIn OAuth2 authentication implementation."""
+import asyncio
 import json
 import logging
 import os
 import secrets
+import time
 from typing import Optional
 import httpx
 from pydantic import BaseModel
 
 from ..config.settings import settings
+from ..linkedin.client import send
+from ..utils.singleflight import SingleFlight, request_key
+from ..utils.state_store import StateStore
 
 logger = logging.getLogger(__name__)
 
@@ -38,13 +43,27 @@ class UserInfo(BaseModel):
 class LinkedInOAuth:
     """LinkedIn OAuth2 client."""
 
-    def __init__(self) -> None:
-        """Initialize the OAuth client."""
+    SESSION_NAMESPACE = "auth"
+    SESSION_KEY = "session"
+    # Seconds between checks for a session established by another worker
+    SESSION_SYNC_INTERVAL = 1.0
+
+    def __init__(self, state_store: Optional[StateStore] = None) -> None:
+        """Initialize the OAuth client.
+
+        Args:
+            state_store: Optional store used to share the session between worker processes
+        """
         self.client_id = settings.LINKEDIN_CLIENT_ID.get_secret_value()
         self.client_secret = settings.LINKEDIN_CLIENT_SECRET.get_secret_value()
         self.redirect_uri = str(settings.LINKEDIN_REDIRECT_URI)
         self._tokens: Optional[OAuthTokens] = None
         self._user_info: Optional[UserInfo] = None
+        self._inflight = SingleFlight()
+        self._state_store = state_store
+        self._expires_at: Optional[float] = None
+        # When the session held here was established, to recognize newer shared ones
+        self._updated_at = 0.0
 
         # Create token storage directory if it doesn't exist
         os.makedirs(settings.TOKEN_STORAGE_PATH, exist_ok=True)
@@ -53,8 +72,72 @@ class LinkedInOAuth:
     @property
     def is_authenticated(self) -> bool:
         """Check if we have valid tokens."""
+        self._expire_session()
+        return self._tokens is not None
+
+    def _expire_session(self) -> None:
+        """Drop the session once its access token expired."""
+        if self._tokens and self._expires_at and time.time() >= self._expires_at:
+            logger.info("Access token expired, authentication required")
+            self._tokens = None
+            self._user_info = None
+            self._expires_at = None
+
+    async def check_authenticated(self) -> bool:
+        """Check if we have valid tokens, first looking for a session from another worker if not.
+
+        Lets a worker serve calls right after authentication went through
+        another worker, without waiting for follow_session to notice.
+        """
+        if not self.is_authenticated and self._state_store:
+            await self._restore_session()
+            self._expire_session()
         return self._tokens is not None
 
+    async def follow_session(self) -> None:
+        """Adopt sessions established by other worker processes until cancelled.
+
+        Checks the state store every SESSION_SYNC_INTERVAL seconds from a
+        worker thread, so the properties never wait for the store.
+        """
+        if not self._state_store:
+            return
+        while True:
+            await self._restore_session()
+            await asyncio.sleep(self.SESSION_SYNC_INTERVAL)
+
+    async def _persist_session(self) -> None:
+        """Share the current tokens and user info with other worker processes."""
+        if not self._state_store or not self._tokens:
+            return
+        ttl = self._expires_at - time.time() if self._expires_at else None
+        self._updated_at = time.time()
+        try:
+            await asyncio.to_thread(self._state_store.set, self.SESSION_NAMESPACE, self.SESSION_KEY, {
+                "tokens": self._tokens.model_dump(),
+                "user_info": self._user_info.model_dump() if self._user_info else None,
+                "expires_at": self._expires_at,
+                "updated_at": self._updated_at,
+            }, ttl=ttl)
+            logger.debug("Session saved to shared state store")
+        except Exception as e:
+            logger.error(f"Failed to save session to state store: {str(e)}")
+
+    async def _restore_session(self) -> None:
+        """Pick up a session established by another worker process if it's newer than ours."""
+        try:
+            session = await asyncio.to_thread(self._state_store.get, self.SESSION_NAMESPACE, self.SESSION_KEY)
+        except Exception as e:
+            logger.error(f"Failed to read session from state store: {str(e)}")
+            return
+        if not session or session.get("updated_at", 0) <= self._updated_at:
+            return
+        self._tokens = OAuthTokens(**session["tokens"])
+        self._user_info = UserInfo(**session["user_info"]) if session.get("user_info") else None
+        self._expires_at = session.get("expires_at")
+        self._updated_at = session.get("updated_at", 0)
+        logger.debug("Session restored from shared state store")
+
     @staticmethod
     def _get_token_path(user_id: str) -> str:
         """Get path to token file for user."""
@@ -116,42 +199,53 @@ class LinkedInOAuth:
         return auth_url, state
 
     async def exchange_code(self, code: str) -> OAuthTokens:
-        """Exchange authorization code for tokens."""
+        """Exchange authorization code for tokens.
+
+        Concurrent exchanges of the same code share one token request.
+        """
+        key = request_key("POST", settings.LINKEDIN_TOKEN_URL, body=code)
+        return await self._inflight.do(key, lambda: self._exchange_code(code))
+
+    async def _exchange_code(self, code: str) -> OAuthTokens:
+        """Send the token request for an authorization code."""
         logger.info("Exchanging authorization code for tokens")
         try:
-            async with httpx.AsyncClient() as client:
-                logger.debug(f"Sending token request to: {settings.LINKEDIN_TOKEN_URL}")
+            logger.debug(f"Sending token request to: {settings.LINKEDIN_TOKEN_URL}")
                 
-                data = {
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "redirect_uri": self.redirect_uri,
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                }
+            data = {
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": self.redirect_uri,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+            }
                 
-                logger.debug(f"Token request parameters: grant_type=authorization_code, code=REDACTED, redirect_uri={self.redirect_uri}")
+            logger.debug(f"Token request parameters: grant_type=authorization_code, code=REDACTED, redirect_uri={self.redirect_uri}")
                 
-                response = await client.post(
-                    str(settings.LINKEDIN_TOKEN_URL),
-                    data=data
-                )
+            response = await send(
+                "POST",
+                settings.LINKEDIN_TOKEN_URL,
+                data=data
+            )
                 
-                if response.status_code != 200:
-                    logger.error(f"Token request failed: {response.status_code} - {response.text}")
-                    raise AuthError(f"Token request failed with status: {response.status_code}")
+            if response.status_code != 200:
+                logger.error(f"Token request failed: {response.status_code} - {response.text}")
+                raise AuthError(f"Token request failed with status: {response.status_code}")
                 
-                response.raise_for_status()
+            response.raise_for_status()
                 
-                # Parse tokens from response
-                token_data = response.json()
-                logger.debug("Token response received successfully")
+            # Parse tokens from response
+            token_data = response.json()
+            logger.debug("Token response received successfully")
                 
-                # Store the tokens
-                self._tokens = OAuthTokens(**token_data)
-                logger.info("Tokens parsed and stored in memory")
+            # Store the tokens
+            self._tokens = OAuthTokens(**token_data)
+            self._expires_at = time.time() + self._tokens.expires_in
+            self._updated_at = time.time()
+            logger.info("Tokens parsed and stored in memory")
+            # Shared with other workers once get_user_info has fetched the matching member
                 
-                return self._tokens
+            return self._tokens
                 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error during token exchange: {str(e)}")
@@ -164,37 +258,47 @@ class LinkedInOAuth:
             raise AuthError(f"Failed to exchange code for tokens: {str(e)}")
 
     async def get_user_info(self) -> UserInfo:
-        """Get user info from LinkedIn."""
+        """Get user info from LinkedIn.
+
+        Concurrent lookups for the same access token share one request.
+        """
         logger.info("Getting user info from LinkedIn")
         
         if not self._tokens:
             logger.error("Not authenticated - no access token available")
             raise AuthError("Not authenticated")
 
+        key = request_key("GET", settings.LINKEDIN_USERINFO_URL, principal=self._tokens.access_token)
+        return await self._inflight.do(key, self._fetch_user_info)
+
+    async def _fetch_user_info(self) -> UserInfo:
+        """Send the user info request."""
         try:
-            async with httpx.AsyncClient() as client:
-                logger.debug(f"Sending user info request to: {settings.LINKEDIN_USERINFO_URL}")
+            logger.debug(f"Sending user info request to: {settings.LINKEDIN_USERINFO_URL}")
                 
-                response = await client.get(
-                    str(settings.LINKEDIN_USERINFO_URL),
-                    headers={"Authorization": f"Bearer {self._tokens.access_token}"}
-                )
+            response = await send(
+                "GET",
+                settings.LINKEDIN_USERINFO_URL,
+                endpoint="userinfo",
+                headers={"Authorization": f"Bearer {self._tokens.access_token}"}
+            )
                 
-                if response.status_code != 200:
-                    logger.error(f"User info request failed: {response.status_code} - {response.text}")
-                    raise AuthError(f"User info request failed with status: {response.status_code}")
+            if response.status_code != 200:
+                logger.error(f"User info request failed: {response.status_code} - {response.text}")
+                raise AuthError(f"User info request failed with status: {response.status_code}")
                 
-                response.raise_for_status()
+            response.raise_for_status()
                 
-                # Parse user info from response
-                user_data = response.json()
-                logger.debug("User info response received successfully")
+            # Parse user info from response
+            user_data = response.json()
+            logger.debug("User info response received successfully")
                 
-                # Store the user info
-                self._user_info = UserInfo(**user_data)
-                logger.info(f"User info retrieved for user: {self._user_info.sub}")
+            # Store the user info
+            self._user_info = UserInfo(**user_data)
+            logger.info(f"User info retrieved for user: {self._user_info.sub}")
+            await self._persist_session()
                 
-                return self._user_info
+            return self._user_info
                 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error during user info request: {str(e)}")
@@ -209,9 +313,11 @@ class LinkedInOAuth:
     @property
     def access_token(self) -> Optional[str]:
         """Get the current access token if we have one."""
+        self._expire_session()
         return self._tokens.access_token if self._tokens else None
 
     @property
     def user_id(self) -> Optional[str]:
         """Get the current user ID if we have one."""
+        self._expire_session()
         return self._user_info.sub if self._user_info else None
@@ -0,0 +1,233 @@
+"""Shared HTTP client and connection warm-up for LinkedIn API requests."""
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+from ..config.settings import settings
+from ..utils.adaptive_limiter import AdaptiveLimiter
+from ..utils.quota import QuotaExceededError, QuotaLedger
+from ..utils.request_scheduler import Priority, RequestScheduler, current_priority
+from ..utils.singleflight import fingerprint
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Concurrency limits for API calls and for media uploads, whose latency depends on file size
+api_limiter = AdaptiveLimiter(
+    "api",
+    initial_limit=settings.ADAPTIVE_LIMIT_INITIAL,
+    min_limit=settings.ADAPTIVE_LIMIT_MIN,
+    max_limit=settings.ADAPTIVE_LIMIT_MAX,
+    backoff=settings.ADAPTIVE_LIMIT_BACKOFF,
+    latency_tolerance=settings.ADAPTIVE_LIMIT_LATENCY_TOLERANCE
+)
+upload_limiter = AdaptiveLimiter(
+    "upload",
+    initial_limit=settings.UPLOAD_MAX_CONNECTIONS,
+    min_limit=settings.ADAPTIVE_LIMIT_MIN,
+    max_limit=settings.UPLOAD_MAX_CONNECTIONS,
+    backoff=settings.ADAPTIVE_LIMIT_BACKOFF,
+    latency_tolerance=None
+)
+# Priority and fair-queuing schedulers in front of each limiter, by limiter name
+schedulers: Dict[str, RequestScheduler] = {}
+# Daily quota accounting for calls that name their endpoint (none if unset)
+quota_ledger: Optional[QuotaLedger] = None
+
+
+def use_quota_ledger(ledger: Optional[QuotaLedger]) -> None:
+    """Count calls against the daily quotas of a ledger before sending them."""
+    global quota_ledger
+    quota_ledger = ledger
+
+
+def scheduler_for(limiter: AdaptiveLimiter) -> RequestScheduler:
+    """Get the scheduler handing out the slots of a limiter."""
+    scheduler = schedulers.get(limiter.name)
+    if scheduler is None:
+        scheduler = schedulers[limiter.name] = RequestScheduler(
+            limiter, starvation_timeout=settings.SCHEDULER_STARVATION_TIMEOUT
+        )
+    return scheduler
+
+
+async def check_quota(endpoint: str, member: Optional[str] = None) -> None:
+    """Fail early if a call to an endpoint would be refused by the daily quotas.
+
+    Raises:
+        QuotaExceededError: If a daily quota for the endpoint is used up
+    """
+    if quota_ledger:
+        await asyncio.to_thread(quota_ledger.check, endpoint, member)
+
+
+async def _reserve_quota(endpoint: str, member: Optional[str], priority: Priority) -> None:
+    """Count a call against the daily quotas.
+
+    Non-interactive calls wait out a throttled endpoint for up to
+    QUOTA_MAX_DEFER seconds instead of failing.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(quota_ledger.reserve, endpoint, member)
+            return
+        except QuotaExceededError as e:
+            if priority == Priority.INTERACTIVE or e.retry_after > settings.QUOTA_MAX_DEFER:
+                raise
+            logger.info(f"Deferring {endpoint} call for {e.retry_after:.0f}s: {str(e)}")
+            await asyncio.sleep(e.retry_after)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the process-wide HTTP client, so requests reuse pooled connections.
+
+    The client is bound to the event loop it was created on; a new one is
+    created if called from another loop.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        logger.debug("Creating shared HTTP client")
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        _client_loop = loop
+    return _client
+
+
+async def send(
+        method: str,
+        url,
+        *,
+        limiter: Optional[AdaptiveLimiter] = None,
+        priority: Optional[Priority] = None,
+        endpoint: Optional[str] = None,
+        member: Optional[str] = None,
+        **kwargs
+) -> httpx.Response:
+    """Send a request to LinkedIn through the shared client and adaptive limiter.
+
+    When the limiter is saturated, requests are scheduled by priority and
+    queued fairly per member, identified by the request's access token so
+    all of a member's calls take the same turns. Calls naming their endpoint
+    are counted against the daily quotas first and refused locally once one
+    is used up.
+    429 and 5xx responses and timeouts count as throttling; cancelled requests
+    and other transport errors leave the limit alone.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        limiter: Limiter to run under (the API limiter if None)
+        priority: Priority class (the priority of the calling context if None)
+        endpoint: API endpoint name the daily quotas are kept for (not counted if None)
+        member: LinkedIn member the call is counted for in the daily quotas
+        **kwargs: Passed on to httpx.AsyncClient.request
+
+    Raises:
+        QuotaExceededError: If a daily quota for the endpoint is used up
+    """
+    priority = current_priority() if priority is None else priority
+    if endpoint and quota_ledger:
+        await _reserve_quota(endpoint, member, priority)
+
+    member_key = fingerprint((kwargs.get("headers") or {}).get("Authorization"))
+    async with scheduler_for(limiter or api_limiter).track(member_key, priority) as sample:
+        try:
+            response = await get_client().request(method, str(url), **kwargs)
+        except httpx.TimeoutException:
+            sample.measured = sample.throttled = True
+            raise
+        sample.measured = True
+        sample.throttled = response.status_code == 429 or response.status_code >= 500
+
+    if response.status_code == 429 and endpoint and quota_ledger:
+        try:
+            retry_after = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            retry_after = None
+        if retry_after is not None:
+            await asyncio.to_thread(quota_ledger.block, endpoint, member, retry_after)
+    return response
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        logger.debug("Closing shared HTTP client")
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def origins(urls: Iterable[str]) -> List[str]:
+    """Get the distinct scheme://host:port origins of some URLs."""
+    result = []
+    for url in urls:
+        parsed = httpx.URL(str(url))
+        origin = str(parsed.copy_with(path="/", query=None, fragment=None))
+        if origin not in result:
+            result.append(origin)
+    return result
+
+
+class ConnectionWarmer:
+    """Open connections to the LinkedIn origins ahead of use and keep them alive.
+
+    Runs in the background: it resolves and connects to every origin right
+    away, then sends a cheap HEAD request on each pooled connection every
+    interval so idle connections aren't dropped before the next tool call.
+    """
+
+    def __init__(self, urls: Iterable[str], connections: int = 1, interval: float = 30.0) -> None:
+        """Initialize the warmer.
+
+        Args:
+            urls: Endpoints whose origins should be kept warm
+            connections: Connections to keep open per origin
+            interval: Seconds between keep-alive pings
+        """
+        self.origins = origins(urls)
+        self.connections = connections
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start warming connections in the background without waiting for them."""
+        if self._task is None or self._task.done():
+            logger.info(f"Pre-warming connections to: {', '.join(self.origins)}")
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the keep-alive pings."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Warm every origin, then keep pinging until stopped."""
+        while True:
+            await asyncio.gather(*(
+                self._ping(origin) for origin in self.origins for _ in range(self.connections)
+            ))
+            await asyncio.sleep(self.interval)
+
+    async def _ping(self, origin: str) -> None:
+        """Send a HEAD request to an origin; only the open connection matters."""
+        try:
+            response = await get_client().head(origin)
+            logger.debug(f"Keep-alive ping to {origin}: {response.status_code}")
+        except httpx.HTTPError as e:
+            logger.debug(f"Keep-alive ping to {origin} failed: {str(e)}")
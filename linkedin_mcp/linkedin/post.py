@@ -1,17 +1,30 @@
 """LinkedIn post management implementation."""
+import asyncio
 from enum import Enum
 import logging
 import mimetypes
 from pathlib import Path
-from typing import Optional, List
+from typing import Awaitable, Callable, Dict, Hashable, Optional, List, Set
 import httpx
 from pydantic import BaseModel, FilePath
 
 from ..config.settings import settings
+from ..linkedin.assets import AssetProcessingError, AssetReadinessPoller
 from ..linkedin.auth import LinkedInOAuth
+from ..linkedin.client import check_quota, send, upload_limiter
+from ..utils.progress import TransferProgress
+from ..utils.request_scheduler import Priority, request_priority
+from ..utils.singleflight import SingleFlight, request_key
+from ..utils.state_store import StateStore
+from ..utils.upload_scheduler import UploadScheduler
 
 logger = logging.getLogger(__name__)
 
+# Receives the number of bytes sent with each uploaded chunk
+BytesCallback = Callable[[int], Awaitable[None]]
+# Receives the overall media upload progress of a post
+ProgressCallback = Callable[[TransferProgress], Awaitable[None]]
+
 class PostCreationError(Exception):
     """Raised when post creation fails."""
     pass
@@ -43,18 +56,70 @@ class PostMediaItem:
     title: str = ""
     description: str = ""
 
+class AssetStatus(str, Enum):
+    """Upload states of a pre-uploaded media asset."""
+    UPLOADING = "UPLOADING"
+    UPLOADED = "UPLOADED"
+    FAILED = "FAILED"
+
+class MediaAsset(BaseModel):
+    """Handle of a media file uploaded ahead of a post."""
+    asset: str
+    recipe_type: str
+    owner: str
+    file_name: str
+    size: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: AssetStatus = AssetStatus.UPLOADING
+    error: Optional[str] = None
+
 class PostRequest(BaseModel):
     """LinkedIn post request model."""
     text: str
     visibility: PostVisibility = PostVisibility.PUBLIC
     media: Optional[List[MediaRequest]] = None
+    # Asset URNs of media uploaded beforehand with PostManager.upload_media
+    media_assets: Optional[List[str]] = None
 
 class PostManager:
     """Manager for LinkedIn posts."""
 
-    def __init__(self, auth_client: LinkedInOAuth) -> None:
-        """Initialize the post manager."""
+    ASSET_NAMESPACE = "assets"
+
+    def __init__(
+            self,
+            auth_client: LinkedInOAuth,
+            upload_scheduler: Optional[UploadScheduler] = None,
+            state_store: Optional[StateStore] = None
+    ) -> None:
+        """Initialize the post manager.
+
+        Args:
+            auth_client: Authenticated LinkedIn OAuth client
+            upload_scheduler: Admission control for media uploads (configured from settings if None)
+            state_store: Optional store used to share uploaded media handles between worker processes
+        """
         self.auth_client = auth_client
+        self._state_store = state_store
+        self.upload_scheduler = upload_scheduler or UploadScheduler(
+            max_bytes=settings.UPLOAD_MAX_INFLIGHT_BYTES,
+            max_connections=settings.UPLOAD_MAX_CONNECTIONS,
+            starvation_timeout=settings.UPLOAD_STARVATION_TIMEOUT
+        )
+        self.asset_poller = AssetReadinessPoller(
+            headers=lambda: self._headers,
+            member=lambda: self.auth_client.user_id,
+            initial_interval=settings.ASSET_POLL_INITIAL_INTERVAL,
+            max_interval=settings.ASSET_POLL_MAX_INTERVAL,
+            batch_size=settings.ASSET_POLL_BATCH_SIZE
+        )
+        self._inflight = SingleFlight()
+        self._upload_listeners: Dict[Hashable, Set[BytesCallback]] = {}
+        # Uploads started by upload_media in this process, by asset URN
+        self._uploads: Dict[str, asyncio.Task] = {}
+        # Media handles, used when there is no state store
+        self._assets: Dict[str, MediaAsset] = {}
 
     @property
     def _headers(self) -> dict:
@@ -93,40 +158,332 @@ class PostManager:
             }
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                str(settings.LINKEDIN_ASSET_REGISTER_URL),
-                headers=self._headers,
-                json=register_data
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            upload_url = data["value"]["uploadMechanism"][
-                "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"
-            ]["uploadUrl"]
-
-            asset_id = data["value"]["asset"]
-
-            return upload_url, asset_id, recipe_type
-
-    async def _upload_media(self, file_path: Path, upload_url: str, media_type: str) -> None:
-        """Upload media file to LinkedIn."""
-        async with httpx.AsyncClient() as client:
+        response = await send(
+            "POST",
+            settings.LINKEDIN_ASSET_REGISTER_URL,
+            endpoint="assets",
+            member=self.auth_client.user_id,
+            headers=self._headers,
+            json=register_data
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        upload_url = data["value"]["uploadMechanism"][
+            "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"
+        ]["uploadUrl"]
+
+        asset_id = data["value"]["asset"]
+
+        return upload_url, asset_id, recipe_type
+
+    async def _upload_media(
+            self,
+            file_path: Path,
+            upload_url: str,
+            media_type: str,
+            on_bytes: Optional[BytesCallback] = None
+    ) -> None:
+        """Upload media file to LinkedIn.
+
+        The file is streamed in chunks, so memory use doesn't grow with file
+        size and cancelling the calling task aborts the transfer mid-file.
+        The transfer waits for admission by the upload scheduler before the
+        file is opened.
+
+        Args:
+            file_path: Path of the file to upload
+            upload_url: Upload URL returned by the asset registration
+            media_type: Recipe type returned by the asset registration
+            on_bytes: Optional coroutine called with the size of every chunk sent
+        """
+        size = Path(file_path).stat().st_size
+        async with self.upload_scheduler.admit(size):
             with open(file_path, "rb") as f:
+                async def chunks():
+                    while chunk := await asyncio.to_thread(f.read, settings.UPLOAD_CHUNK_SIZE):
+                        yield chunk
+                        if on_bytes:
+                            await on_bytes(len(chunk))
+
                 headers = {
                     "Authorization": f"Bearer {self.auth_client.access_token}",
-                    "media-type-family": "STILLIMAGE" if media_type == "feedshare-image" else "VIDEO"
+                    "media-type-family": "STILLIMAGE" if media_type == "feedshare-image" else "VIDEO",
+                    "Content-Length": str(size)
                 }
-                response = await client.post(
+                response = await send(
+                    "POST",
                     upload_url,
+                    limiter=upload_limiter,
                     headers=headers,
-                    content=f.read()
+                    content=chunks()
                 )
                 response.raise_for_status()
 
-    async def create_post(self, post_request: PostRequest) -> str:
-        """Create a new LinkedIn post with optional media attachments."""
+    async def _notify_upload_listeners(self, key: Hashable, size: int) -> None:
+        """Pass upload progress to every caller waiting on the upload."""
+        for listener in list(self._upload_listeners.get(key, ())):
+            try:
+                await listener(size)
+            except Exception as e:
+                logger.warning(f"Upload progress listener failed, detaching it: {str(e)}")
+                self._upload_listeners.get(key, set()).discard(listener)
+
+    async def _upload_asset(self, file_path: Path, on_bytes: Optional[BytesCallback] = None) -> tuple[str, str]:
+        """Register and upload a media file, sharing in-flight uploads of the same file.
+
+        Concurrent posts attaching the same unchanged file reuse one asset
+        registration and upload instead of repeating them. Every waiting
+        caller receives progress for the shared upload until it stops waiting.
+
+        Returns:
+            Tuple of (asset_id, media_type)
+        """
+        stat = Path(file_path).stat()
+        key = request_key(
+            "POST",
+            settings.LINKEDIN_ASSET_REGISTER_URL,
+            principal=self.auth_client.access_token,
+            body=(str(Path(file_path).resolve()), stat.st_size, stat.st_mtime_ns)
+        )
+
+        async def register_and_upload() -> tuple[str, str]:
+            upload_url, asset_id, recipe_type = await self._register_upload(file_path)
+            await self._upload_media(
+                file_path, upload_url, recipe_type,
+                on_bytes=lambda size: self._notify_upload_listeners(key, size)
+            )
+            return asset_id, recipe_type
+
+        listeners = self._upload_listeners.setdefault(key, set())
+        if on_bytes:
+            listeners.add(on_bytes)
+        try:
+            return await self._inflight.do(key, register_and_upload)
+        finally:
+            listeners.discard(on_bytes)
+            if not listeners and self._upload_listeners.get(key) is listeners:
+                del self._upload_listeners[key]
+
+    async def _save_asset(self, asset: MediaAsset) -> None:
+        """Remember a media handle for ASSET_CACHE_TTL seconds.
+
+        The state store is written from a worker thread, as it may wait for
+        other worker processes' writes.
+        """
+        if self._state_store:
+            await asyncio.to_thread(
+                self._state_store.set,
+                self.ASSET_NAMESPACE, asset.asset, asset.model_dump(mode="json"), ttl=settings.ASSET_CACHE_TTL
+            )
+        else:
+            self._assets[asset.asset] = asset
+
+    async def _load_asset(self, asset_urn: str) -> Optional[MediaAsset]:
+        """Look up a media handle."""
+        if self._state_store:
+            data = await asyncio.to_thread(self._state_store.get, self.ASSET_NAMESPACE, asset_urn)
+            return MediaAsset(**data) if data else None
+        return self._assets.get(asset_urn)
+
+    async def _complete_upload(
+            self,
+            asset: MediaAsset,
+            file_path: Path,
+            upload_url: str,
+            on_bytes: Optional[BytesCallback] = None
+    ) -> MediaAsset:
+        """Upload a registered file and record the outcome on its handle."""
+        try:
+            await self._upload_media(file_path, upload_url, asset.recipe_type, on_bytes=on_bytes)
+        except asyncio.CancelledError:
+            await self._save_asset(asset.model_copy(update={"status": AssetStatus.FAILED, "error": "Upload cancelled"}))
+            raise
+        except (OSError, httpx.HTTPError) as e:
+            error_msg = f"Failed to upload {asset.file_name}: {str(e)}"
+            logger.error(error_msg)
+            await self._save_asset(asset.model_copy(update={"status": AssetStatus.FAILED, "error": str(e)}))
+            raise MediaUploadError(error_msg) from e
+
+        asset = asset.model_copy(update={"status": AssetStatus.UPLOADED})
+        await self._save_asset(asset)
+        logger.info(f"Uploaded {asset.file_name} as {asset.asset}")
+        return asset
+
+    def _upload_finished(self, asset_urn: str, task: asyncio.Task) -> None:
+        """Forget a finished upload task; its outcome is kept on the handle."""
+        if self._uploads.get(asset_urn) is task:
+            del self._uploads[asset_urn]
+        if not task.cancelled():
+            # Retrieved so unawaited background failures aren't reported as unhandled
+            task.exception()
+
+    async def upload_media(
+            self,
+            media: List[MediaRequest],
+            wait: bool = False,
+            progress: Optional[ProgressCallback] = None
+    ) -> List[MediaAsset]:
+        """Register and upload media files ahead of a post.
+
+        Each file is registered right away and gets a handle (its asset URN)
+        that create_post accepts through PostRequest.media_assets, for as many
+        posts as needed. Uploads go on in the background unless waited for;
+        create_post waits for any upload still running. Background uploads
+        are sent at background priority, so they don't hold up interactive
+        calls.
+
+        Args:
+            media: Files to upload
+            wait: Wait until all uploads finished
+            progress: Optional coroutine called with the combined upload progress (only when waiting)
+
+        Returns:
+            Handles of the uploaded files; failed uploads have status FAILED and an error
+        """
+        if not self.auth_client.user_id:
+            logger.error("No authenticated user")
+            raise MediaUploadError("No authenticated user")
+
+        upload_progress = TransferProgress(sum(Path(m.file_path).stat().st_size for m in media))
+
+        async def on_bytes(size: int) -> None:
+            nonlocal progress
+            upload_progress.advance(size)
+            if progress:
+                try:
+                    await progress(upload_progress)
+                except Exception as e:
+                    # A client that went away mustn't abort the upload
+                    logger.warning(f"Upload progress callback failed, detaching it: {str(e)}")
+                    progress = None
+
+        # Register every file before uploading any, so a file that can't be
+        # registered doesn't leave uploads running without handles
+        registered = []
+        for media_item in media:
+            file_path = Path(media_item.file_path)
+            try:
+                upload_url, asset_urn, recipe_type = await self._register_upload(file_path)
+            except httpx.HTTPError as e:
+                error_msg = f"Failed to register {file_path.name}: {str(e)}"
+                logger.error(error_msg)
+                raise MediaUploadError(error_msg) from e
+
+            asset = MediaAsset(
+                asset=asset_urn,
+                recipe_type=recipe_type,
+                owner=self.auth_client.user_id,
+                file_name=file_path.name,
+                size=file_path.stat().st_size,
+                title=media_item.title,
+                description=media_item.description
+            )
+            registered.append((asset, file_path, upload_url))
+
+        assets, tasks = [], []
+        for asset, file_path, upload_url in registered:
+            await self._save_asset(asset)
+            with request_priority(Priority.INTERACTIVE if wait else Priority.BACKGROUND):
+                task = asyncio.create_task(
+                    self._complete_upload(asset, file_path, upload_url, on_bytes=on_bytes if wait else None)
+                )
+            task.add_done_callback(lambda t, urn=asset.asset: self._upload_finished(urn, t))
+            self._uploads[asset.asset] = task
+            assets.append(asset)
+            tasks.append(task)
+
+        if not wait:
+            return assets
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return [await self._load_asset(asset.asset) or asset for asset in assets]
+
+    async def _resolve_asset(self, asset_urn: str) -> MediaAsset:
+        """Get the handle of pre-uploaded media, waiting for its upload if it's still running here.
+
+        The handle of an upload running in another worker process is returned
+        as UPLOADING; create_post follows it while waiting for the media.
+        """
+        task = self._uploads.get(asset_urn)
+        if task:
+            logger.info(f"Waiting for upload of {asset_urn} to finish")
+            try:
+                # Shielded: the upload may be used by other drafts too
+                await asyncio.shield(task)
+            except MediaUploadError:
+                pass
+
+        asset = await self._load_asset(asset_urn)
+        if asset is None or asset.owner != self.auth_client.user_id:
+            raise PostCreationError(f"Unknown media asset {asset_urn}; upload it with upload_media first")
+        if asset.status == AssetStatus.FAILED:
+            raise PostCreationError(f"Upload of {asset.file_name} ({asset_urn}) failed: {asset.error}")
+        return asset
+
+    async def _watch_uploads(self, asset_urns: List[str]) -> None:
+        """Follow uploads running in other worker processes until they finished.
+
+        Raises:
+            PostCreationError: As soon as one of the uploads failed
+        """
+        pending = list(asset_urns)
+        interval = settings.ASSET_POLL_INITIAL_INTERVAL
+        while pending:
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, settings.ASSET_POLL_MAX_INTERVAL)
+            for asset_urn in list(pending):
+                asset = await self._load_asset(asset_urn)
+                if asset and asset.status == AssetStatus.FAILED:
+                    error_msg = f"Upload of {asset.file_name} ({asset_urn}) failed: {asset.error}"
+                    logger.error(error_msg)
+                    raise PostCreationError(error_msg)
+                if asset is None or asset.status == AssetStatus.UPLOADED:
+                    pending.remove(asset_urn)
+
+    async def _wait_until_available(self, asset_ids: List[str], uploading: List[str]) -> None:
+        """Wait for LinkedIn to process the media, failing early if an upload elsewhere fails.
+
+        Args:
+            asset_ids: Assets of the post
+            uploading: Assets still being uploaded by another worker process
+        """
+        if not uploading:
+            await self.asset_poller.wait_until_available(asset_ids, settings.ASSET_READY_TIMEOUT)
+            return
+
+        ready = asyncio.create_task(self.asset_poller.wait_until_available(asset_ids, settings.ASSET_READY_TIMEOUT))
+        watch = asyncio.create_task(self._watch_uploads(uploading))
+        try:
+            await asyncio.wait({ready, watch}, return_when=asyncio.FIRST_COMPLETED)
+            if watch.done():
+                watch.result()
+            await ready
+        finally:
+            for task in (ready, watch):
+                if not task.done():
+                    task.cancel()
+
+    async def close(self) -> None:
+        """Cancel the uploads still running in the background and wait until they stopped."""
+        tasks = list(self._uploads.values())
+        if not tasks:
+            return
+        logger.info(f"Cancelling {len(tasks)} background media upload(s)")
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def create_post(self, post_request: PostRequest, progress: Optional[ProgressCallback] = None) -> str:
+        """Create a new LinkedIn post with optional media attachments.
+
+        Media is published only once LinkedIn has finished processing every
+        uploaded asset, or the post fails after ASSET_READY_TIMEOUT seconds,
+        or as soon as an upload it waits for failed.
+
+        Args:
+            post_request: The post to create
+            progress: Optional coroutine called with the combined upload progress of all media
+        """
         logger.info(f"Creating LinkedIn post with visibility: {post_request.visibility}")
 
         if not post_request.text.strip():
@@ -137,6 +494,9 @@ class PostManager:
             logger.error("No authenticated user")
             raise PostCreationError("No authenticated user")
 
+        # Don't upload media for a post the daily quota won't let through
+        await check_quota("ugcPosts", self.auth_client.user_id)
+
         # Build post payload
         payload = {
             "author": f"urn:li:person:{self.auth_client.user_id}",
@@ -155,13 +515,20 @@ class PostManager:
         }
 
         # Handle media attachments
-        if post_request.media:
+        if post_request.media or post_request.media_assets:
             media_list = []
+            uploading = []
             recipe_type = None
-            for media_item in post_request.media:
+            upload_progress = TransferProgress(sum(Path(m.file_path).stat().st_size for m in post_request.media or []))
+
+            async def on_bytes(size: int) -> None:
+                upload_progress.advance(size)
+                if progress:
+                    await progress(upload_progress)
+
+            for media_item in post_request.media or []:
                 # Register and upload each media file
-                upload_url, asset_id, recipe_type = await self._register_upload(media_item.file_path)
-                await self._upload_media(media_item.file_path, upload_url, recipe_type)
+                asset_id, recipe_type = await self._upload_asset(media_item.file_path, on_bytes)
 
                 # Add media to post payload with required fields
                 media_list.append({
@@ -171,6 +538,28 @@ class PostManager:
                     "description": {"text": media_item.description or f"Image {len(media_list) + 1} description"}
                 })
 
+            for asset_urn in post_request.media_assets or []:
+                # Media uploaded beforehand
+                asset = await self._resolve_asset(asset_urn)
+                if asset.status == AssetStatus.UPLOADING:
+                    uploading.append(asset.asset)
+                recipe_type = asset.recipe_type
+                media_list.append({
+                    "status": "READY",
+                    "media": asset.asset,
+                    "title": {"text": asset.title or f"Image {len(media_list) + 1}"},
+                    "description": {"text": asset.description or f"Image {len(media_list) + 1} description"}
+                })
+
+            # Wait for LinkedIn to finish processing the media before publishing
+            asset_ids = [item["media"] for item in media_list]
+            logger.info(f"Waiting for {len(asset_ids)} media asset(s) to become available")
+            try:
+                await self._wait_until_available(asset_ids, uploading)
+            except AssetProcessingError as e:
+                logger.error(str(e))
+                raise PostCreationError(str(e)) from e
+
             # Update payload with media
             payload["specificContent"]["com.linkedin.ugc.ShareContent"].update({
                 "shareMediaCategory": (
@@ -181,21 +570,23 @@ class PostManager:
             })
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    str(settings.LINKEDIN_POST_URL),
-                    headers=self._headers,
-                    json=payload
-                )
-                response.raise_for_status()
+            response = await send(
+                "POST",
+                settings.LINKEDIN_POST_URL,
+                endpoint="ugcPosts",
+                member=self.auth_client.user_id,
+                headers=self._headers,
+                json=payload
+            )
+            response.raise_for_status()
 
-                post_id = response.headers.get("x-restli-id")
-                if not post_id:
-                    logger.error("No post ID returned from LinkedIn")
-                    raise PostCreationError("No post ID returned from LinkedIn")
+            post_id = response.headers.get("x-restli-id")
+            if not post_id:
+                logger.error("No post ID returned from LinkedIn")
+                raise PostCreationError("No post ID returned from LinkedIn")
 
-                logger.info(f"Successfully created LinkedIn post with ID: {post_id}")
-                return post_id
+            logger.info(f"Successfully created LinkedIn post with ID: {post_id}")
+            return post_id
 
         except httpx.HTTPError as e:
             error_msg = f"Failed to create post: {str(e)}"
@@ -0,0 +1,4 @@
+"""Load testing tools for the LinkedIn MCP server.
+
+Run with ``python -m linkedin_mcp.loadtest --help``.
+"""
@@ -0,0 +1,77 @@
+"""Command line entry point for the load test harness."""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from .fake_api import FakeLinkedInAPI
+from .harness import LoadTest, LoadTestConfig, parse_mix, prepare_environment
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    """Parse the load test options."""
+    defaults = LoadTestConfig()
+    parser = argparse.ArgumentParser(
+        prog="python -m linkedin_mcp.loadtest",
+        description="Drive the LinkedIn MCP server with concurrent tool calls against a fake LinkedIn API."
+    )
+    parser.add_argument("--mode", choices=["in-process", "subprocess"], default=defaults.mode)
+    parser.add_argument("--transport", choices=["stdio", "streamable-http"], default=defaults.transport,
+                        help="Transport for subprocess mode; stdio clients share one session")
+    parser.add_argument("--workers", type=int, default=defaults.workers, help="Server workers for streamable-http")
+    parser.add_argument("--clients", type=int, default=defaults.clients)
+    parser.add_argument("--rate", type=float, default=defaults.rate, help="Tool calls per second")
+    parser.add_argument("--duration", type=float, default=defaults.duration, help="Seconds to generate load")
+    parser.add_argument("--max-inflight", type=int, default=defaults.max_inflight)
+    parser.add_argument("--mix", type=parse_mix, default=defaults.mix,
+                        help="Weighted scenarios, e.g. create_post=8,create_post_media=1,create_post_video=1")
+    parser.add_argument("--media-size", type=int, default=defaults.media_size, help="Bytes per media attachment")
+    parser.add_argument("--api-latency", type=float, default=defaults.api_latency, help="Fake API latency in seconds")
+    parser.add_argument("--api-error-rate", type=float, default=defaults.api_error_rate)
+    parser.add_argument("--api-processing-delay", type=float, default=defaults.api_processing_delay,
+                        help="Seconds the fake API takes to process an uploaded video")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", type=Path, default=Path("loadtest-report.json"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Run a load test and write its report."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    args = _parse_args(argv)
+    config = LoadTestConfig(**{
+        key: value for key, value in vars(args).items() if key in LoadTestConfig.model_fields
+    })
+
+    api = FakeLinkedInAPI(
+        latency=config.api_latency,
+        error_rate=config.api_error_rate,
+        processing_delay=config.api_processing_delay
+    )
+    api.start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="linkedin-mcp-loadtest-") as workdir:
+            media = prepare_environment(api, Path(workdir), config)
+            logger.info(f"Running {config.mode} load test: {config.rate}/s for {config.duration}s, mix {config.mix}")
+            report = asyncio.run(LoadTest(config, api, media, Path(workdir)).run())
+    finally:
+        api.stop()
+
+    args.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    totals = report["totals"]
+    print(f"{totals['calls']} calls, {totals['error_rate']:.1%} errors, "
+          f"{totals['throughput_per_s']}/s over {totals['elapsed_s']}s", file=sys.stderr)
+    for name, tool in report["tools"].items():
+        latency = tool["latency_ms"]
+        print(f"  {name}: p50 {latency.get('p50')}ms p99 {latency.get('p99')}ms, "
+              f"{tool['error_rate']:.1%} errors", file=sys.stderr)
+    print(f"Report written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
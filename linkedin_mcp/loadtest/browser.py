@@ -0,0 +1,18 @@
+"""Headless stand-in for the web browser opened by the authenticate tool.
+
+Set as the BROWSER command, it visits the authorization URL and follows the
+fake API's redirect to the local OAuth callback server.
+"""
+import sys
+
+import httpx
+
+
+def main() -> None:
+    """Follow the authorization URL given on the command line."""
+    response = httpx.get(sys.argv[1], follow_redirects=True, timeout=30)
+    sys.exit(0 if response.status_code == 200 else 1)
+
+
+if __name__ == "__main__":
+    main()
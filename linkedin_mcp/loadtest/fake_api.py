@@ -0,0 +1,225 @@
+"""Local stand-in for the LinkedIn API endpoints used by the server."""
+import asyncio
+import itertools
+import logging
+import random
+import secrets
+import socket
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse, Response
+from starlette.routing import Route
+
+logger = logging.getLogger(__name__)
+
+
+def free_port() -> int:
+    """Get a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeLinkedInAPI:
+    """Serves the OAuth, user info, asset and post endpoints from a background thread.
+
+    Every endpoint waits for the configured latency and fails with a 500 at the
+    configured error rate, so the server can be exercised without touching
+    LinkedIn. Uploaded videos report PROCESSING until the processing delay has
+    passed; images are available as soon as they are uploaded.
+    """
+
+    def __init__(
+            self,
+            port: Optional[int] = None,
+            latency: float = 0.05,
+            error_rate: float = 0.0,
+            processing_delay: float = 2.0
+    ) -> None:
+        """Initialize the fake API.
+
+        Args:
+            port: Port to listen on (a free port is picked if None)
+            latency: Seconds each request takes
+            error_rate: Fraction of requests answered with a 500
+            processing_delay: Seconds an uploaded video takes to become available
+        """
+        self.port = port or free_port()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.processing_delay = processing_delay
+        # Recipe and upload completion time (None until uploaded) per asset ID
+        self.assets: Dict[str, dict] = {}
+        self.requests: Dict[str, int] = {}
+        self.uploaded_bytes = 0
+        self._ids = itertools.count(1)
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self.app = Starlette(routes=[
+            Route("/oauth/v2/authorization", self.authorize, methods=["GET"]),
+            Route("/oauth/v2/accessToken", self.access_token, methods=["POST"]),
+            Route("/v2/userinfo", self.userinfo, methods=["GET"]),
+            Route("/v2/assets", self.register_upload, methods=["POST"]),
+            Route("/v2/assets", self.batch_get_assets, methods=["GET"]),
+            Route("/v2/assets/{asset_id}", self.get_asset, methods=["GET"]),
+            Route("/media/upload/{asset_id}", self.upload, methods=["POST", "PUT"]),
+            Route("/v2/ugcPosts", self.create_post, methods=["POST"]),
+        ])
+
+    @property
+    def base_url(self) -> str:
+        """Get the root URL of the fake API."""
+        return f"http://127.0.0.1:{self.port}"
+
+    def env(self) -> Dict[str, str]:
+        """Get the settings overrides pointing the server at this API."""
+        return {
+            "LINKEDIN_AUTH_URL": f"{self.base_url}/oauth/v2/authorization",
+            "LINKEDIN_TOKEN_URL": f"{self.base_url}/oauth/v2/accessToken",
+            "LINKEDIN_USERINFO_URL": f"{self.base_url}/v2/userinfo",
+            "LINKEDIN_POST_URL": f"{self.base_url}/v2/ugcPosts",
+            "LINKEDIN_ASSET_REGISTER_URL": f"{self.base_url}/v2/assets?action=registerUpload",
+            "LINKEDIN_ASSETS_URL": f"{self.base_url}/v2/assets",
+        }
+
+    async def _simulate(self, request: Request) -> Optional[Response]:
+        """Count the request, apply latency and maybe inject a failure."""
+        if "/media/upload/" in request.url.path:
+            name = "upload"
+        elif request.url.path.startswith("/v2/assets") and request.method == "GET":
+            name = "assetStatus"
+        else:
+            name = request.url.path.split("/")[-1]
+        self.requests[name] = self.requests.get(name, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            return JSONResponse({"message": "Injected failure"}, status_code=500)
+        return None
+
+    async def authorize(self, request: Request) -> Response:
+        """Approve the login right away and redirect back with a code."""
+        params = request.query_params
+        query = urlencode({"code": secrets.token_urlsafe(16), "state": params.get("state", "")})
+        return RedirectResponse(f"{params.get('redirect_uri')}?{query}", status_code=302)
+
+    async def access_token(self, request: Request) -> Response:
+        """Issue tokens for any authorization code."""
+        return await self._simulate(request) or JSONResponse({
+            "access_token": secrets.token_urlsafe(32),
+            "expires_in": 5184000,
+            "scope": "openid,profile,email,w_member_social",
+        })
+
+    async def userinfo(self, request: Request) -> Response:
+        """Describe a fixed test member."""
+        return await self._simulate(request) or JSONResponse({
+            "sub": "loadtest-member",
+            "name": "Load Test",
+            "given_name": "Load",
+            "family_name": "Test",
+        })
+
+    async def register_upload(self, request: Request) -> Response:
+        """Register an asset and hand out its upload URL."""
+        failure = await self._simulate(request)
+        if failure:
+            return failure
+        asset_id = f"C{next(self._ids):08d}"
+        body = await request.json()
+        recipe = body["registerUploadRequest"]["recipes"][0]
+        self.assets[asset_id] = {"recipe": recipe, "uploaded": None}
+        return JSONResponse({"value": {
+            "asset": f"urn:li:digitalmediaAsset:{asset_id}",
+            "uploadMechanism": {
+                "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest": {
+                    "uploadUrl": f"{self.base_url}/media/upload/{asset_id}"
+                }
+            },
+        }})
+
+    async def upload(self, request: Request) -> Response:
+        """Consume an uploaded file."""
+        async for chunk in request.stream():
+            self.uploaded_bytes += len(chunk)
+        failure = await self._simulate(request)
+        if failure:
+            return failure
+        asset = self.assets.get(request.path_params["asset_id"])
+        if asset is not None:
+            asset["uploaded"] = time.monotonic()
+        return Response(status_code=201)
+
+    def _asset(self, asset_id: str) -> Optional[dict]:
+        """Describe an asset and the processing status of its recipe."""
+        asset = self.assets.get(asset_id)
+        if asset is None:
+            return None
+        if asset["uploaded"] is None:
+            status = "WAITING_UPLOAD"
+        elif asset["recipe"].endswith("feedshare-video") and time.monotonic() - asset["uploaded"] < self.processing_delay:
+            status = "PROCESSING"
+        else:
+            status = "AVAILABLE"
+        return {
+            "id": asset_id,
+            "recipes": [{"recipe": asset["recipe"], "status": status}],
+        }
+
+    async def get_asset(self, request: Request) -> Response:
+        """Get one asset's status."""
+        failure = await self._simulate(request)
+        if failure:
+            return failure
+        asset = self._asset(request.path_params["asset_id"])
+        if asset is None:
+            return JSONResponse({"message": "Not found", "status": 404}, status_code=404)
+        return JSONResponse(asset)
+
+    async def batch_get_assets(self, request: Request) -> Response:
+        """Get the status of several assets given as ids=List(a,b)."""
+        failure = await self._simulate(request)
+        if failure:
+            return failure
+        ids = request.query_params.get("ids", "").removeprefix("List(").removesuffix(")")
+        results, errors = {}, {}
+        for asset_id in filter(None, ids.split(",")):
+            asset = self._asset(asset_id)
+            if asset is None:
+                errors[asset_id] = {"status": 404, "message": "Not found"}
+            else:
+                results[asset_id] = asset
+        return JSONResponse({"results": results, "errors": errors})
+
+    async def create_post(self, request: Request) -> Response:
+        """Accept a post and return its ID."""
+        await request.body()
+        return await self._simulate(request) or Response(
+            status_code=201, headers={"x-restli-id": f"urn:li:share:{next(self._ids)}"}
+        )
+
+    def start(self) -> None:
+        """Start serving in a daemon thread and wait until it accepts connections."""
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Fake LinkedIn API did not start")
+            time.sleep(0.05)
+        logger.info(f"Fake LinkedIn API listening on {self.base_url}")
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server:
+            self._server.should_exit = True
+        if self._thread:
+            self._thread.join(timeout=5)
@@ -0,0 +1,406 @@
+"""Load generator driving the LinkedIn MCP server with concurrent tool calls."""
+import asyncio
+import logging
+import os
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Literal, Optional
+
+from mcp import ClientSession
+from pydantic import BaseModel, Field
+
+from .fake_api import FakeLinkedInAPI, free_port
+
+logger = logging.getLogger(__name__)
+
+# Tool calls the load generator knows how to issue
+SCENARIOS = ("create_post", "create_post_media", "create_post_video", "authenticate")
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class LoadTestConfig(BaseModel):
+    """Load test parameters."""
+    mode: Literal["in-process", "subprocess"] = "subprocess"
+    transport: Literal["stdio", "streamable-http"] = "stdio"
+    workers: int = Field(default=1, ge=1)
+    clients: int = Field(default=10, ge=1)
+    rate: float = Field(default=20.0, gt=0, description="Tool calls started per second across all clients")
+    duration: float = Field(default=30.0, gt=0)
+    max_inflight: int = Field(default=200, ge=1)
+    mix: Dict[str, float] = {"create_post": 1.0}
+    media_size: int = Field(default=1024 * 1024, ge=1)
+    api_latency: float = 0.05
+    api_error_rate: float = 0.0
+    api_processing_delay: float = 2.0
+    sample_interval: float = 1.0
+    seed: Optional[int] = None
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse a tool mix such as 'create_post=8,create_post_media=1,authenticate=1'."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}', expected one of: {', '.join(SCENARIOS)}")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Summarize values (in seconds) as millisecond percentiles."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    summary = {
+        f"p{p}": ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in PERCENTILES
+    }
+    summary["max"] = ordered[-1]
+    summary["mean"] = sum(ordered) / len(ordered)
+    return {key: round(value * 1000, 1) for key, value in summary.items()}
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    """Get the resident set size of a process from /proc, if available."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def _descendants(pid: int) -> List[int]:
+    """Get the IDs of all child processes of pid, recursively."""
+    children = defaultdict(list)
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return []
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The process name may contain spaces, the parent ID follows its closing parenthesis
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children[ppid].append(int(entry))
+    result, pending = [], [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            result.append(child)
+            pending.append(child)
+    return result
+
+
+def _wait_for_port(port: int, timeout: float = 30.0) -> None:
+    """Block until something listens on a localhost port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"Server did not start listening on port {port}")
+
+
+def prepare_environment(api: FakeLinkedInAPI, workdir: Path, config: LoadTestConfig) -> Dict[str, Path]:
+    """Point the server settings at the fake API and an isolated work directory.
+
+    Must run before linkedin_mcp.server is imported, since settings are read
+    at import time.
+
+    Returns:
+        Paths of the generated image and video files
+    """
+    package_root = str(Path(__file__).resolve().parents[2])
+    os.environ.update(api.env())
+    os.environ.update({
+        "LINKEDIN_CLIENT_ID": os.environ.get("LINKEDIN_CLIENT_ID", "loadtest"),
+        "LINKEDIN_CLIENT_SECRET": os.environ.get("LINKEDIN_CLIENT_SECRET", "loadtest"),
+        "LINKEDIN_REDIRECT_URI": "http://localhost:3000/callback",
+        "STATE_DB_PATH": str(workdir / "state.db"),
+        "TOKEN_STORAGE_PATH": str(workdir / "tokens"),
+        "BROWSER": f"{sys.executable} -m linkedin_mcp.loadtest.browser %s",
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+        "PYTHONPATH": os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")])),
+    })
+    media = {"image": workdir / "loadtest.png", "video": workdir / "loadtest.mp4"}
+    for path in media.values():
+        path.write_bytes(secrets.token_bytes(config.media_size))
+    return media
+
+
+class LoadTest:
+    """Runs one load test and builds its report."""
+
+    def __init__(self, config: LoadTestConfig, api: FakeLinkedInAPI, media: Dict[str, Path], workdir: Path) -> None:
+        """Initialize the load test.
+
+        Args:
+            config: Load test parameters
+            api: Running fake LinkedIn API the server talks to
+            media: Image and video files attached by the media scenarios
+            workdir: Directory for server logs and state
+        """
+        self.config = config
+        self.api = api
+        self.media = media
+        self.workdir = workdir
+        self._random = random.Random(config.seed)
+        self._latencies: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Dict[str, Counter] = defaultdict(Counter)
+        self._loop_lags: List[float] = []
+        self._window_lag = 0.0
+        self._timeseries: List[dict] = []
+        self._inflight = 0
+        self._backlogged = 0
+        self._server_pid: Optional[int] = None
+        # The authenticate tool listens for its callback on a fixed port, so logins can't overlap
+        self._auth_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def _sessions(self) -> AsyncIterator[List[ClientSession]]:
+        """Start the server and connect the configured clients to it."""
+        config = self.config
+        async with AsyncExitStack() as stack:
+            sessions = []
+            if config.mode == "in-process":
+                from mcp.shared.memory import create_connected_server_and_client_session
+                from .. import server
+
+                for _ in range(config.clients):
+                    sessions.append(await stack.enter_async_context(
+                        create_connected_server_and_client_session(server.mcp._mcp_server)
+                    ))
+            elif config.transport == "stdio":
+                from mcp import StdioServerParameters
+                from mcp.client.stdio import stdio_client
+
+                # stdio serves exactly one client, so all clients share its session
+                errlog = stack.enter_context(open(self.workdir / "server.log", "w"))
+                params = StdioServerParameters(command=sys.executable, args=["-m", "linkedin_mcp"], env=dict(os.environ))
+                read, write = await stack.enter_async_context(stdio_client(params, errlog=errlog))
+                session = await stack.enter_async_context(ClientSession(read, write))
+                await session.initialize()
+                sessions = [session] * config.clients
+            else:
+                from mcp.client.streamable_http import streamablehttp_client
+
+                port = free_port()
+                errlog = stack.enter_context(open(self.workdir / "server.log", "w"))
+                process = subprocess.Popen(
+                    [sys.executable, "-m", "linkedin_mcp", "--transport", "streamable-http",
+                     "--port", str(port), "--workers", str(config.workers)],
+                    stdout=errlog, stderr=subprocess.STDOUT
+                )
+                self._server_pid = process.pid
+
+                def stop_server():
+                    process.terminate()
+                    try:
+                        process.wait(timeout=30)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+
+                stack.callback(stop_server)
+                await asyncio.to_thread(_wait_for_port, port)
+                for _ in range(config.clients):
+                    read, write, _ = await stack.enter_async_context(
+                        streamablehttp_client(f"http://127.0.0.1:{port}/mcp", timeout=120)
+                    )
+                    session = await stack.enter_async_context(ClientSession(read, write))
+                    await session.initialize()
+                    sessions.append(session)
+            yield sessions
+
+    def _arguments(self, scenario: str) -> tuple[str, dict]:
+        """Get the tool name and arguments for a scenario."""
+        text = f"Load test post {secrets.token_hex(4)}"
+        if scenario == "create_post":
+            return "create_post", {"text": text}
+        if scenario == "create_post_media":
+            return "create_post", {"text": text, "media_files": [str(self.media["image"])]}
+        if scenario == "create_post_video":
+            return "create_post", {"text": text, "media_files": [str(self.media["video"])]}
+        return "authenticate", {}
+
+    async def _call(self, session: ClientSession, scenario: str) -> Optional[str]:
+        """Issue one tool call and record its latency and outcome.
+
+        Authenticate calls are issued one at a time; their latency doesn't
+        include the wait for the previous one.
+
+        Returns:
+            Error message, or None on success
+        """
+        if scenario == "authenticate":
+            async with self._auth_lock:
+                return await self._issue(session, scenario)
+        return await self._issue(session, scenario)
+
+    async def _issue(self, session: ClientSession, scenario: str) -> Optional[str]:
+        """Call the tool for a scenario and record the result."""
+        tool, arguments = self._arguments(scenario)
+        error = None
+        self._inflight += 1
+        started = time.perf_counter()
+        try:
+            result = await session.call_tool(tool, arguments)
+            if result.isError:
+                error = " ".join(getattr(item, "text", "") for item in result.content) or "Tool error"
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+        finally:
+            self._inflight -= 1
+        self._latencies[scenario].append(time.perf_counter() - started)
+        if error:
+            self._errors[scenario][error[:120]] += 1
+        return error
+
+    async def _watch_loop_lag(self) -> None:
+        """Measure how late the event loop wakes up from short sleeps."""
+        interval = 0.05
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = max(time.perf_counter() - started - interval, 0.0)
+            self._loop_lags.append(lag)
+            self._window_lag = max(self._window_lag, lag)
+
+    def _memory(self) -> Optional[int]:
+        """Get the resident memory of the server process(es)."""
+        if self.config.mode == "in-process":
+            return _rss_bytes(os.getpid())
+        pids = _descendants(os.getpid())
+        sizes = [size for size in map(_rss_bytes, pids) if size is not None]
+        return sum(sizes) if sizes else None
+
+    async def _sample(self, started: float) -> None:
+        """Record memory, load and loop lag once per sample interval."""
+        while True:
+            await asyncio.sleep(self.config.sample_interval)
+            self._timeseries.append({
+                "t": round(time.perf_counter() - started, 1),
+                "rss_bytes": self._memory(),
+                "inflight": self._inflight,
+                "completed": sum(len(v) for v in self._latencies.values()),
+                "errors": sum(sum(c.values()) for c in self._errors.values()),
+                "loop_lag_ms_max": round(self._window_lag * 1000, 1),
+            })
+            self._window_lag = 0.0
+
+    async def _drive(self, sessions: List[ClientSession]) -> float:
+        """Start tool calls at the target rate for the configured duration.
+
+        Returns:
+            Seconds from the first call until the last one finished
+        """
+        config = self.config
+        names, weights = zip(*config.mix.items())
+        limit = asyncio.Semaphore(config.max_inflight)
+        tasks = set()
+        started = time.perf_counter()
+        count = 0
+        while (now := time.perf_counter()) - started < config.duration:
+            due = started + count / config.rate
+            if due > now:
+                await asyncio.sleep(due - now)
+            if limit.locked():
+                self._backlogged += 1
+            await limit.acquire()
+            scenario = self._random.choices(names, weights)[0]
+            task = asyncio.create_task(self._call(sessions[count % len(sessions)], scenario))
+            tasks.add(task)
+            task.add_done_callback(lambda t: (tasks.discard(t), limit.release()))
+            count += 1
+        if tasks:
+            await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+    async def run(self) -> dict:
+        """Run the load test.
+
+        Returns:
+            The report
+        """
+        config = self.config
+        async with self._sessions() as sessions:
+            if any(name.startswith("create_post") for name in config.mix):
+                logger.info("Authenticating against the fake API before the run")
+                error = await self._call(sessions[0], "authenticate")
+                if error:
+                    raise RuntimeError(f"Initial authentication failed: {error}")
+                self._latencies.clear()
+
+            baseline_rss = self._memory()
+            lag_watcher = asyncio.create_task(self._watch_loop_lag())
+            sampler = asyncio.create_task(self._sample(time.perf_counter()))
+            try:
+                elapsed = await self._drive(sessions)
+            finally:
+                lag_watcher.cancel()
+                sampler.cancel()
+            final_rss = self._memory()
+
+        return self._report(elapsed, baseline_rss, final_rss)
+
+    def _report(self, elapsed: float, baseline_rss: Optional[int], final_rss: Optional[int]) -> dict:
+        """Build the report from the recorded measurements."""
+        from .. import __version__
+
+        tools = {}
+        for scenario, latencies in sorted(self._latencies.items()):
+            errors = sum(self._errors[scenario].values())
+            tools[scenario] = {
+                "calls": len(latencies),
+                "errors": errors,
+                "error_rate": round(errors / len(latencies), 4),
+                "latency_ms": percentiles(latencies),
+                "top_errors": dict(self._errors[scenario].most_common(5)),
+            }
+        calls = sum(tool["calls"] for tool in tools.values())
+        errors = sum(tool["errors"] for tool in tools.values())
+        rss_samples = [s["rss_bytes"] for s in self._timeseries if s["rss_bytes"] is not None]
+        return {
+            "version": __version__,
+            "config": self.config.model_dump(),
+            "totals": {
+                "calls": calls,
+                "errors": errors,
+                "error_rate": round(errors / calls, 4) if calls else 0.0,
+                "throughput_per_s": round(calls / elapsed, 2) if elapsed else 0.0,
+                "elapsed_s": round(elapsed, 2),
+                "backlogged_starts": self._backlogged,
+            },
+            "tools": tools,
+            "event_loop_lag_ms": {
+                # In subprocess mode only the load generator's own loop can be observed
+                "scope": "server" if self.config.mode == "in-process" else "client",
+                **percentiles(self._loop_lags),
+            },
+            "memory": {
+                "scope": "process" if self.config.mode == "in-process" else "server processes",
+                "baseline_rss_bytes": baseline_rss,
+                "peak_rss_bytes": max(rss_samples, default=None),
+                "final_rss_bytes": final_rss,
+            },
+            "fake_api": {
+                "requests": dict(sorted(self.api.requests.items())),
+                "uploaded_bytes": self.api.uploaded_bytes,
+            },
+            "timeseries": self._timeseries,
+        }
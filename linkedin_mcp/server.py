@@ -1,6 +1,12 @@
 """MCP server for LinkedIn integration."""
+import argparse
+import asyncio
+import json
 import logging
+import os
+import time
 import webbrowser
+from contextlib import asynccontextmanager
 from typing import List
 
 from dotenv import load_dotenv
@@ -8,9 +14,18 @@ from mcp.server.fastmcp import FastMCP, Context
 from pydantic import FilePath
 
 from .linkedin.auth import LinkedInOAuth, AuthError
-from .linkedin.post import PostManager, PostRequest, PostCreationError, MediaRequest, PostVisibility
+from .linkedin.client import (
+    ConnectionWarmer, api_limiter, close_client, schedulers, upload_limiter, use_quota_ledger
+)
+from .linkedin.post import (
+    PostManager, PostRequest, PostCreationError, MediaRequest, MediaUploadError, PostVisibility
+)
 from .callback_server import LinkedInCallbackServer
 from .utils.logging import configure_logging
+from .utils.loop_monitor import LoopMonitor, instrument_tool
+from .utils.progress import TransferProgress
+from .utils.quota import QuotaExceededError, QuotaLedger
+from .utils.state_store import StateStore
 from .config.settings import settings
 
 # Configure logging
@@ -19,6 +34,69 @@ configure_logging(
 )
 logger = logging.getLogger(__name__)
 
+_runtime_users = 0
+_warmer = None
+_background: List[asyncio.Task] = []
+loop_monitor = LoopMonitor(threshold=settings.LOOP_BLOCK_THRESHOLD, debug=settings.LOOP_MONITOR_ASYNCIO_DEBUG)
+
+
+async def _purge_state() -> None:
+    """Remove expired tokens, media handles and quota counters from the state store."""
+    while True:
+        try:
+            removed = await asyncio.to_thread(state_store.purge_expired)
+            logger.debug(f"Purged {removed} expired state entries")
+        except Exception as e:
+            logger.warning(f"Failed to purge expired state: {str(e)}")
+        await asyncio.sleep(settings.STATE_PURGE_INTERVAL)
+
+
+@asynccontextmanager
+async def runtime(_server=None):
+    """Keep process-wide services running while any session or app uses them.
+
+    Entered by every MCP session and, for HTTP transports, by the app for its
+    whole lifetime, so per-request sessions don't restart the services. Starts
+    connection warm-up in the background without delaying readiness, and
+    cancels background media uploads and closes the shared HTTP client when
+    the last user leaves. Meanwhile, sessions established by other workers
+    are adopted and expired shared state is purged every
+    STATE_PURGE_INTERVAL seconds.
+    """
+    global _runtime_users, _warmer
+    _runtime_users += 1
+    if _runtime_users == 1 and settings.LOOP_MONITOR:
+        loop_monitor.start()
+    if _runtime_users == 1:
+        _background.extend([
+            asyncio.create_task(auth_client.follow_session()),
+            asyncio.create_task(_purge_state()),
+        ])
+    if _runtime_users == 1 and settings.HTTP_PREWARM:
+        _warmer = ConnectionWarmer(
+            [settings.LINKEDIN_TOKEN_URL, settings.LINKEDIN_USERINFO_URL, settings.LINKEDIN_POST_URL,
+             settings.LINKEDIN_ASSET_REGISTER_URL],
+            connections=settings.HTTP_PREWARM_CONNECTIONS,
+            interval=settings.HTTP_KEEPALIVE_INTERVAL
+        )
+        _warmer.start()
+    try:
+        yield {}
+    finally:
+        _runtime_users -= 1
+        if _runtime_users == 0:
+            for task in _background:
+                task.cancel()
+            await asyncio.gather(*_background, return_exceptions=True)
+            _background.clear()
+            if _warmer:
+                await _warmer.stop()
+                _warmer = None
+            await loop_monitor.stop()
+            await post_manager.close()
+            await close_client()
+
+
 # Initialize MCP server
 mcp = FastMCP(
     "LinkedInServer",
@@ -28,15 +106,69 @@ mcp = FastMCP(
         "pydantic",
         "pydantic-settings",
         "python-dotenv"
-    ]
+    ],
+    lifespan=runtime
 )
 
+# Shared state for all worker processes
+state_store = StateStore(settings.STATE_DB_PATH)
+
+# Daily API quotas, counted in the shared state so they hold across workers and restarts
+quota_ledger = QuotaLedger(
+    state_store,
+    app_limits=settings.QUOTA_APP_DAILY_LIMITS,
+    member_limits=settings.QUOTA_MEMBER_DAILY_LIMITS
+)
+use_quota_ledger(quota_ledger)
+
 # Initialize LinkedIn clients
-auth_client = LinkedInOAuth()
-post_manager = PostManager(auth_client)
+auth_client = LinkedInOAuth(state_store)
+post_manager = PostManager(auth_client, state_store=state_store)
+
+
+def _upload_reporter(ctx: Context = None):
+    """Create a progress callback passing upload progress to the client."""
+    last_update = 0.0
+
+    async def report_upload(progress: TransferProgress) -> None:
+        nonlocal last_update
+        if not ctx:
+            return
+        await ctx.report_progress(progress.transferred, progress.total)
+        # Throughput and ETA as a log message, at most once per second
+        if progress.done or time.monotonic() - last_update >= 1.0:
+            last_update = time.monotonic()
+            await ctx.info(f"Uploading media: {progress.describe()}")
+
+    return report_upload
+
+
+async def _media_requests(
+        media_files: List[FilePath],
+        media_titles: List[str] = None,
+        media_descriptions: List[str] = None,
+        ctx: Context = None
+) -> List[MediaRequest]:
+    """Pair media files with their optional titles and descriptions."""
+    media_requests = []
+    for i, file_path in enumerate(media_files):
+        title = media_titles[i] if media_titles and i < len(media_titles) else None
+        description = media_descriptions[i] if media_descriptions and i < len(media_descriptions) else None
+
+        logger.debug(f"Processing media file: {file_path}, title: {title}")
+        if ctx:
+            await ctx.info(f"Processing media file: {file_path}, title: {title}")
+
+        media_requests.append(MediaRequest(
+            file_path=file_path,
+            title=title,
+            description=description
+        ))
+    return media_requests
 
 
 @mcp.tool()
+@instrument_tool
 async def authenticate(ctx: Context = None) -> str:
     """Start LinkedIn authentication flow and handle callback automatically.
 
@@ -57,7 +189,7 @@ async def authenticate(ctx: Context = None) -> str:
         logger.debug(f"Authorization URL generated with state: {expected_state}")
 
         if ctx:
-            ctx.info("Opening browser for authentication...")
+            await ctx.info("Opening browser for authentication...")
 
         # Open browser
         logger.info(f"Opening browser to: {auth_url}")
@@ -65,12 +197,12 @@ async def authenticate(ctx: Context = None) -> str:
             error_msg = "Failed to open browser. Please visit the URL manually: " + auth_url
             logger.error(error_msg)
             if ctx:
-                ctx.error(error_msg)
+                await ctx.error(error_msg)
             raise RuntimeError(error_msg)
 
         logger.info("Waiting for authentication callback...")
         if ctx:
-            ctx.info("Waiting for authentication callback...")
+            await ctx.info("Waiting for authentication callback...")
 
         # Add debug info for event status
         logger.debug(f"Auth received event status before wait: {callback_server.auth_received.is_set()}")
@@ -104,7 +236,7 @@ async def authenticate(ctx: Context = None) -> str:
         logger.debug(f"State parameter matches expected value: {state}")
 
         if ctx:
-            ctx.info("Exchanging authorization code for tokens...")
+            await ctx.info("Exchanging authorization code for tokens...")
 
         # Exchange code for tokens
         logger.info("Exchanging authorization code for tokens")
@@ -116,7 +248,7 @@ async def authenticate(ctx: Context = None) -> str:
         logger.debug("Successfully obtained tokens from authorization code")
 
         if ctx:
-            ctx.info("Getting user info...")
+            await ctx.info("Getting user info...")
 
         # Get and save user info
         logger.info("Getting user info & saving tokens...")
@@ -134,13 +266,13 @@ async def authenticate(ctx: Context = None) -> str:
         error_msg = f"Authentication error: {str(e)}"
         logger.error(error_msg)
         if ctx:
-            ctx.error(error_msg)
+            await ctx.error(error_msg)
         raise RuntimeError(error_msg)
     except Exception as e:
         error_msg = f"Authentication failed: {str(e)}"
         logger.exception("Unexpected error during authentication")
         if ctx:
-            ctx.error(error_msg)
+            await ctx.error(error_msg)
         raise RuntimeError(error_msg)
     finally:
         # Ensure server is stopped
@@ -150,11 +282,13 @@ async def authenticate(ctx: Context = None) -> str:
 
 
 @mcp.tool()
+@instrument_tool
 async def create_post(
         text: str,
         media_files: List[FilePath] = None,
         media_titles: List[str] = None,
         media_descriptions: List[str] = None,
+        media_assets: List[str] = None,
         visibility: PostVisibility = "PUBLIC",
         ctx: Context = None
 ) -> str:
@@ -165,6 +299,7 @@ async def create_post(
         media_files: List of paths to media files to attach (images or videos)
         media_titles: Optional titles for media attachments
         media_descriptions: Optional descriptions for media attachments
+        media_assets: Asset URNs returned by upload_media to attach, after any media_files
         visibility: Post visibility (PUBLIC or CONNECTIONS)
         ctx: MCP Context for progress reporting
 
@@ -174,64 +309,219 @@ async def create_post(
     logger.info("Creating LinkedIn post...")
     try:
         if ctx:
-            ctx.info(f"Creating LinkedIn post with visibility: {visibility}")
+            await ctx.info(f"Creating LinkedIn post with visibility: {visibility}")
 
-        if not auth_client.is_authenticated:
+        if not await auth_client.check_authenticated():
             error_msg = "Not authenticated. Please authenticate first."
             logger.error(error_msg)
             if ctx:
-                ctx.error(error_msg)
+                await ctx.error(error_msg)
             raise RuntimeError(error_msg)
 
         # Prepare media requests if files are provided
         media_requests = None
         if media_files:
-            media_requests = []
-            for i, file_path in enumerate(media_files):
-                title = media_titles[i] if media_titles and i < len(media_titles) else None
-                description = media_descriptions[i] if media_descriptions and i < len(media_descriptions) else None
-
-                logger.debug(f"Processing media file: {file_path}, title: {title}")
-                if ctx:
-                    ctx.info(f"Processing media file: {file_path}, title: {title}")
-
-                media_requests.append(MediaRequest(
-                    file_path=file_path,
-                    title=title,
-                    description=description
-                ))
+            media_requests = await _media_requests(media_files, media_titles, media_descriptions, ctx)
 
         # Create post request
         post_request = PostRequest(
             text=text,
             visibility=visibility,
-            media=media_requests
+            media=media_requests,
+            media_assets=media_assets
         )
 
         # Create the post
         logger.info("Sending post to LinkedIn API")
-        post_id = await post_manager.create_post(post_request)
+        post_id = await post_manager.create_post(post_request, progress=_upload_reporter(ctx))
         success_msg = f"Successfully created LinkedIn post with ID: {post_id}"
         logger.info(success_msg)
 
         return success_msg
 
-    except (AuthError, PostCreationError) as e:
+    except asyncio.CancelledError:
+        logger.info("Post creation cancelled by client, aborting uploads")
+        raise
+    except (AuthError, PostCreationError, QuotaExceededError) as e:
         error_msg = str(e)
         logger.error(error_msg)
         if ctx:
-            ctx.error(error_msg)
+            await ctx.error(error_msg)
         raise RuntimeError(error_msg)
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
         logger.exception("Unexpected error during post creation")
         if ctx:
-            ctx.error(error_msg)
+            await ctx.error(error_msg)
         raise RuntimeError(error_msg)
 
 
-def main():
+@mcp.tool()
+@instrument_tool
+async def upload_media(
+        media_files: List[FilePath],
+        media_titles: List[str] = None,
+        media_descriptions: List[str] = None,
+        wait: bool = False,
+        ctx: Context = None
+) -> str:
+    """Upload media files ahead of a post and get handles to attach them with create_post.
+
+    Uploads continue in the background while the post is being written, and
+    create_post waits for any that haven't finished. A handle can be attached
+    to several posts.
+
+    Args:
+        media_files: List of paths to media files to upload (images or videos)
+        media_titles: Optional titles for the media
+        media_descriptions: Optional descriptions for the media
+        wait: Wait until the uploads finished instead of uploading in the background
+        ctx: MCP Context for progress reporting
+
+    Returns:
+        JSON list of media handles; pass their "asset" values as media_assets to create_post
+    """
+    logger.info(f"Uploading {len(media_files)} media file(s)...")
+    try:
+        if not await auth_client.check_authenticated():
+            error_msg = "Not authenticated. Please authenticate first."
+            logger.error(error_msg)
+            if ctx:
+                await ctx.error(error_msg)
+            raise RuntimeError(error_msg)
+
+        media_requests = await _media_requests(media_files, media_titles, media_descriptions, ctx)
+        assets = await post_manager.upload_media(media_requests, wait=wait, progress=_upload_reporter(ctx))
+        return json.dumps([asset.model_dump(mode="json") for asset in assets], indent=2)
+
+    except asyncio.CancelledError:
+        logger.info("Media upload cancelled by client, aborting uploads")
+        raise
+    except (AuthError, MediaUploadError, QuotaExceededError) as e:
+        error_msg = str(e)
+        logger.error(error_msg)
+        if ctx:
+            await ctx.error(error_msg)
+        raise RuntimeError(error_msg)
+    except Exception as e:
+        error_msg = f"Unexpected error: {str(e)}"
+        logger.exception("Unexpected error during media upload")
+        if ctx:
+            await ctx.error(error_msg)
+        raise RuntimeError(error_msg)
+
+
+@mcp.tool()
+@instrument_tool
+async def get_quota() -> str:
+    """Get today's LinkedIn API usage and remaining daily quota, to plan batches of calls.
+
+    Returns:
+        JSON with calls used, budget and remaining calls by endpoint ("*" for all endpoints)
+        for the app and the authenticated member, and the seconds until the quotas reset
+    """
+    member = auth_client.user_id if await auth_client.check_authenticated() else None
+    return json.dumps(await asyncio.to_thread(quota_ledger.report, member), indent=2)
+
+
+@mcp.tool()
+@instrument_tool
+async def get_server_metrics() -> str:
+    """Get load and concurrency metrics of the server process handling the call.
+
+    Returns:
+        JSON with the adaptive concurrency limits, their recent decisions, per-priority queueing,
+        upload admission state and, when LOOP_MONITOR is enabled, event-loop lag and blocking counters
+    """
+    scheduler = post_manager.upload_scheduler
+    return json.dumps({
+        "pid": os.getpid(),
+        "concurrency": {
+            "api": api_limiter.snapshot(),
+            "upload": upload_limiter.snapshot(),
+        },
+        "scheduling": {name: scheduler.snapshot() for name, scheduler in schedulers.items()},
+        "uploads": {
+            "inflight": scheduler.inflight_count,
+            "inflight_bytes": scheduler.inflight_bytes,
+            "queued": scheduler.queued,
+        },
+        "event_loop": loop_monitor.snapshot() if loop_monitor.running else None,
+    }, indent=2)
+
+
+def create_http_app():
+    """Create the ASGI app for the configured HTTP transport.
+
+    Used as the uvicorn app factory, so each worker process builds its own app
+    from the environment-provided settings.
+    """
+    if settings.MCP_TRANSPORT == "sse":
+        app = mcp.sse_app()
+    else:
+        # Sessions can't follow a client between workers, so every request must stand alone
+        mcp.settings.stateless_http = settings.MCP_WORKERS > 1
+        app = mcp.streamable_http_app()
+
+    inner_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app_):
+        logger.info(f"Worker {os.getpid()} serving {settings.MCP_TRANSPORT} transport")
+        try:
+            async with runtime(), inner_lifespan(app_) as state:
+                yield state
+        finally:
+            logger.info(f"Worker {os.getpid()} shutting down")
+            state_store.close()
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line overrides for the transport settings."""
+    parser = argparse.ArgumentParser(prog="linkedin-mcp", description="LinkedIn MCP server")
+    parser.add_argument("--transport", choices=["stdio", "sse", "streamable-http"], default=settings.MCP_TRANSPORT)
+    parser.add_argument("--host", default=settings.MCP_HOST)
+    parser.add_argument("--port", type=int, default=settings.MCP_PORT)
+    parser.add_argument("--workers", type=int, default=settings.MCP_WORKERS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main function for running the LinkedIn server."""
     load_dotenv()
-    logger.info("Starting LinkedIn server...")
-    mcp.run()
+    args = _parse_args(argv)
+    logger.info(f"Starting LinkedIn server with {args.transport} transport...")
+
+    if args.transport == "stdio":
+        mcp.run()
+        return
+
+    if args.workers < 1:
+        raise SystemExit("--workers must be at least 1")
+    if args.transport == "sse" and args.workers > 1:
+        raise SystemExit("The sse transport keeps sessions in memory; use streamable-http for multiple workers")
+
+    # Worker processes re-import the server, so hand the overrides down through the environment
+    os.environ.update({
+        "MCP_TRANSPORT": args.transport,
+        "MCP_HOST": args.host,
+        "MCP_PORT": str(args.port),
+        "MCP_WORKERS": str(args.workers),
+    })
+    settings.MCP_TRANSPORT = args.transport
+    settings.MCP_WORKERS = args.workers
+
+    import uvicorn
+    logger.info(f"Serving on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    uvicorn.run(
+        "linkedin_mcp.server:create_http_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=settings.LOG_LEVEL.lower(),
+        timeout_graceful_shutdown=settings.MCP_SHUTDOWN_TIMEOUT,
+    )
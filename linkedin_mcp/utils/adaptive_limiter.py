@@ -0,0 +1,172 @@
+"""Adaptive concurrency limit driven by observed latency and throttling."""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Sample:
+    """Outcome of one request made under the limiter."""
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.throttled = False
+        # Left unset for requests whose outcome says nothing about server load
+        self.measured = False
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit with a latency gradient.
+
+    Every successful request that ran while the limit was (nearly) fully used
+    grows the limit by 1/limit, i.e. about one slot per round trip. A 429,
+    5xx or timeout - or, for latency-sensitive limiters, a short-term latency
+    exceeding the long-term baseline by the tolerance factor - multiplies it
+    by the backoff ratio, at most once per smoothed round trip so a burst of
+    failures counts as one congestion signal.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            initial_limit: float = 10,
+            min_limit: float = 1,
+            max_limit: float = 100,
+            backoff: float = 0.7,
+            latency_tolerance: Optional[float] = 2.0
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            name: Name used in logs and metrics
+            initial_limit: Concurrency allowed before any feedback
+            min_limit: Lowest limit the limiter backs off to
+            max_limit: Highest limit the limiter grows to
+            backoff: Factor applied to the limit on congestion
+            latency_tolerance: Short/long latency ratio treated as congestion (None ignores latency)
+        """
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.inflight = 0
+        self.short_latency: Optional[float] = None
+        self.long_latency: Optional[float] = None
+        self.increases = 0
+        self.decreases = 0
+        self.throttled = 0
+        self.decisions: Deque[dict] = deque(maxlen=20)
+        self._last_decrease = 0.0
+        self._waiters: List[asyncio.Future] = []
+
+    @property
+    def queued(self) -> int:
+        """Get the number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    def has_capacity(self) -> bool:
+        """Check if a slot is free under the current limit."""
+        return self.inflight < max(math.floor(self.limit), 1)
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters in arrival order."""
+        while self._waiters and self.has_capacity():
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot under the current limit."""
+        if not self._waiters and self.has_capacity():
+            self.inflight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Return a slot."""
+        self.inflight -= 1
+        self._wake()
+
+    def _set_limit(self, limit: float, reason: str) -> None:
+        old = self.limit
+        self.limit = min(max(limit, self.min_limit), self.max_limit)
+        if math.floor(self.limit) != math.floor(old):
+            logger.debug(f"{self.name} concurrency limit {old:.1f} -> {self.limit:.1f} ({reason})")
+            self.decisions.append({"time": time.time(), "from": round(old, 2), "to": round(self.limit, 2), "reason": reason})
+        self._wake()
+
+    def record(self, sample: Sample) -> None:
+        """Adjust the limit from the outcome of a finished request."""
+        if not sample.measured:
+            return
+        now = time.monotonic()
+        latency = now - sample.started
+        self.short_latency = latency if self.short_latency is None else 0.5 * self.short_latency + 0.5 * latency
+        self.long_latency = latency if self.long_latency is None else 0.95 * self.long_latency + 0.05 * latency
+
+        reason = None
+        if sample.throttled:
+            self.throttled += 1
+            reason = "throttled"
+        elif self.latency_tolerance and self.short_latency > self.latency_tolerance * self.long_latency:
+            reason = "latency"
+
+        if reason:
+            # One decrease per round trip: requests already in flight saw the old limit
+            if now - self._last_decrease >= (self.short_latency or 0):
+                self._last_decrease = now
+                self.decreases += 1
+                self._set_limit(self.limit * self.backoff, reason)
+        elif self.inflight + 1 >= math.floor(self.limit) and self.limit < self.max_limit:
+            self.increases += 1
+            self._set_limit(self.limit + 1 / self.limit, "success")
+
+    @asynccontextmanager
+    async def track(self, acquired: bool = False) -> AsyncIterator[Sample]:
+        """Hold a slot for one request and learn from its outcome.
+
+        The caller marks the yielded sample as measured (and throttled where
+        appropriate) once the request completed.
+
+        Args:
+            acquired: The caller already holds a slot taken with acquire()
+        """
+        if not acquired:
+            await self.acquire()
+        sample = Sample()
+        try:
+            yield sample
+        finally:
+            self.release()
+            self.record(sample)
+
+    def snapshot(self) -> dict:
+        """Get the current state and recent decisions as metrics."""
+        return {
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "queued": self.queued,
+            "short_latency_ms": round(self.short_latency * 1000, 1) if self.short_latency is not None else None,
+            "long_latency_ms": round(self.long_latency * 1000, 1) if self.long_latency is not None else None,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "throttled": self.throttled,
+            "recent_decisions": list(self.decisions),
+        }
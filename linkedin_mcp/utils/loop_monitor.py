@@ -0,0 +1,170 @@
+"""Event-loop lag and blocking-callback detection."""
+import asyncio
+import functools
+import logging
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tool name for each task currently running a tool call
+_task_tools: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+
+
+@contextmanager
+def tool_scope(name: str) -> Iterator[None]:
+    """Attribute loop blocks inside this block to the named tool."""
+    task = asyncio.current_task()
+    previous = _task_tools.get(task) if task else None
+    if task:
+        _task_tools[task] = name
+    try:
+        yield
+    finally:
+        if task:
+            if previous is None:
+                _task_tools.pop(task, None)
+            else:
+                _task_tools[task] = previous
+
+
+def instrument_tool(fn: Callable) -> Callable:
+    """Decorate an async tool so loop blocks during its calls name it."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with tool_scope(fn.__name__):
+            return await fn(*args, **kwargs)
+    return wrapper
+
+
+class LoopMonitor:
+    """Watch an event loop for lag and callbacks that block it.
+
+    A heartbeat task on the loop records how late it wakes up. A watchdog
+    thread notices when the heartbeat stalls for longer than the threshold
+    while the block is still ongoing, and logs the loop thread's stack and
+    the tool being run at that moment.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05, debug: bool = False) -> None:
+        """Initialize the monitor.
+
+        Args:
+            threshold: Seconds a callback may hold the loop before it counts as blocking
+            interval: Seconds between heartbeats
+            debug: Also enable asyncio debug mode, which logs slow callbacks by name
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.debug = debug
+        self.blocks = 0
+        self.blocked_seconds = 0.0
+        self.max_block = 0.0
+        self.blocks_by_tool: Counter = Counter()
+        self.lags: Deque[float] = deque(maxlen=1200)
+        self._beat = 0.0
+        self._block_tool: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Check if the monitor is watching a loop."""
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start watching the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        if self.debug:
+            self._loop.set_debug(True)
+            self._loop.slow_callback_duration = self.threshold
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (threshold {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        """Stop watching."""
+        if not self.running:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog = None
+        logger.info("Event loop monitor stopped")
+
+    async def _heartbeat(self) -> None:
+        """Measure loop lag and account for blocks once the loop runs again."""
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - self._beat - self.interval, 0.0)
+            self._beat = now
+            self.lags.append(lag)
+            if lag >= self.threshold:
+                tool = self._block_tool or "unknown"
+                self.blocks += 1
+                self.blocked_seconds += lag
+                self.max_block = max(self.max_block, lag)
+                self.blocks_by_tool[tool] += 1
+                logger.debug(f"Event loop was blocked for {lag * 1000:.0f}ms (tool: {tool})")
+            self._block_tool = None
+
+    def _current_tool(self) -> Optional[str]:
+        """Get the tool whose task holds the loop right now."""
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            return None
+        return _task_tools.get(task) if task else None
+
+    def _watch(self) -> None:
+        """Report blocks while they happen, from outside the loop thread."""
+        reported_beat = None
+        while not self._stopped.wait(self.threshold / 4):
+            beat = self._beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled < self.threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            self._block_tool = self._current_tool() or "unknown"
+            frame = sys._current_frames().get(self._thread_id)
+            stack = "".join(traceback.format_stack(frame, limit=15)) if frame else "unavailable"
+            logger.warning(
+                f"Event loop blocked for over {stalled * 1000:.0f}ms in tool {self._block_tool}; "
+                f"blocking stack:\n{stack}"
+            )
+
+    def snapshot(self) -> dict:
+        """Get lag and blocking counters as metrics."""
+        lags = sorted(self.lags)
+        return {
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "lag_ms": {
+                "last": round(self.lags[-1] * 1000, 1) if self.lags else None,
+                "p99": round(lags[int(len(lags) * 0.99)] * 1000, 1) if lags else None,
+                "max": round(lags[-1] * 1000, 1) if lags else None,
+            },
+            "blocks": self.blocks,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "max_block_ms": round(self.max_block * 1000, 1),
+            "blocks_by_tool": dict(self.blocks_by_tool),
+        }
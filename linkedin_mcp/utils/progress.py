@@ -0,0 +1,69 @@
+"""Transfer progress tracking with throughput and ETA estimates."""
+import time
+from typing import Optional
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count for humans, e.g. 3.2 MB."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class TransferProgress:
+    """Byte progress of a transfer."""
+
+    def __init__(self, total: int) -> None:
+        """Initialize the tracker.
+
+        Args:
+            total: Total number of bytes to transfer
+        """
+        self.total = total
+        self.transferred = 0
+        self.started = time.monotonic()
+
+    def advance(self, size: int) -> None:
+        """Record that size more bytes were transferred."""
+        self.transferred += size
+
+    @property
+    def done(self) -> bool:
+        """Check if all bytes were transferred."""
+        return self.transferred >= self.total
+
+    @property
+    def fraction(self) -> float:
+        """Get the completed fraction between 0 and 1."""
+        return min(self.transferred / self.total, 1.0) if self.total else 1.0
+
+    @property
+    def elapsed(self) -> float:
+        """Get seconds since the transfer started."""
+        return time.monotonic() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Get the average throughput in bytes per second."""
+        elapsed = self.elapsed
+        return self.transferred / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Get the estimated seconds remaining, or None before any data was sent."""
+        throughput = self.throughput
+        if not throughput:
+            return None
+        return max(self.total - self.transferred, 0) / throughput
+
+    def describe(self) -> str:
+        """Get a one-line summary such as '12.0 MB / 48.0 MB (25%) at 3.1 MB/s, ETA 12s'."""
+        summary = (
+            f"{format_bytes(self.transferred)} / {format_bytes(self.total)} "
+            f"({self.fraction:.0%}) at {format_bytes(self.throughput)}/s"
+        )
+        eta = self.eta
+        if eta is not None and not self.done:
+            summary += f", ETA {eta:.0f}s"
+        return summary
@@ -0,0 +1,185 @@
+"""Daily API quota accounting persisted in the state store."""
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from .state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+# Budget key covering all endpoints
+ALL_ENDPOINTS = "*"
+
+
+class QuotaExceededError(Exception):
+    """Raised when a call would exceed a daily quota."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _day_bounds(now: Optional[float] = None) -> Tuple[str, float]:
+    """Get the current UTC day and the seconds until it ends, as LinkedIn's quotas reset at midnight UTC."""
+    current = datetime.fromtimestamp(time.time() if now is None else now, tz=timezone.utc)
+    midnight = datetime.combine(current.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    return current.date().isoformat(), (midnight - current).total_seconds()
+
+
+class QuotaLedger:
+    """Count API calls per day by endpoint for the app and each member, against daily budgets.
+
+    Counters live in the state store, so they survive restarts and are shared
+    by all worker processes. A call is reserved before it is sent and refused
+    locally if it would exceed any budget for its endpoint or for all
+    endpoints. A 429 with a Retry-After header blocks the endpoint for that
+    long, since LinkedIn counts calls we may not have seen.
+    """
+
+    NAMESPACE = "quota"
+
+    def __init__(
+            self,
+            state_store: StateStore,
+            app_limits: Optional[Dict[str, int]] = None,
+            member_limits: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Initialize the ledger.
+
+        Args:
+            state_store: Store holding the counters
+            app_limits: Daily calls allowed for the whole app by endpoint ("*" for all endpoints)
+            member_limits: Daily calls allowed per member by endpoint ("*" for all endpoints)
+        """
+        self.state_store = state_store
+        self.app_limits = app_limits or {}
+        self.member_limits = member_limits or {}
+
+    def _scopes(self, endpoint: str, member: Optional[str]) -> List[Tuple[str, str, Optional[int]]]:
+        """Get the (scope, endpoint, budget) counters a call to an endpoint counts against."""
+        scopes = [
+            ("app", endpoint, self.app_limits.get(endpoint)),
+            ("app", ALL_ENDPOINTS, self.app_limits.get(ALL_ENDPOINTS)),
+        ]
+        if member:
+            scopes += [
+                (f"member:{member}", endpoint, self.member_limits.get(endpoint)),
+                (f"member:{member}", ALL_ENDPOINTS, self.member_limits.get(ALL_ENDPOINTS)),
+            ]
+        return scopes
+
+    def _keys(self, day: str, endpoint: str, member: Optional[str]) -> List[Tuple[str, str, str, Optional[int]]]:
+        """Get the (counter key, blocked key, description, budget) of every counter a call counts against."""
+        return [
+            (f"{day}:{scope}:{name}", f"blocked:{scope}:{name}", f"{name} calls for {scope}", limit)
+            for scope, name, limit in self._scopes(endpoint, member)
+        ]
+
+    @staticmethod
+    def _verify(values: dict, keys: list, reset_in: float) -> None:
+        """Raise if any counter is blocked or at its budget."""
+        for counter, blocked, description, limit in keys:
+            blocked_until = values.get(blocked)
+            if blocked_until and blocked_until > time.time():
+                raise QuotaExceededError(
+                    f"LinkedIn throttled {description}; retry in {blocked_until - time.time():.0f}s",
+                    retry_after=blocked_until - time.time()
+                )
+            if limit is not None and values.get(counter, 0) >= limit:
+                raise QuotaExceededError(
+                    f"Daily quota of {limit} {description} used up; resets in {reset_in / 3600:.1f}h",
+                    retry_after=reset_in
+                )
+
+    def check(self, endpoint: str, member: Optional[str] = None) -> None:
+        """Check that a call could be made now, without counting it.
+
+        Lets callers give up before doing work that leads up to the call.
+        Queries the store, so call it off the event loop.
+
+        Args:
+            endpoint: Name of the API endpoint
+            member: LinkedIn member the call is made for (only app budgets apply if None)
+
+        Raises:
+            QuotaExceededError: If the call would exceed a budget or the endpoint is blocked
+        """
+        day, reset_in = _day_bounds()
+        keys = self._keys(day, endpoint, member)
+        values = self.state_store.get_many(self.NAMESPACE, [key for entry in keys for key in entry[:2]])
+        self._verify(values, keys, reset_in)
+
+    def reserve(self, endpoint: str, member: Optional[str] = None) -> None:
+        """Count a call about to be sent.
+
+        Checks and updates every counter in one transaction, which may wait
+        for other workers, so call it off the event loop.
+
+        Args:
+            endpoint: Name of the API endpoint
+            member: LinkedIn member the call is made for (only app budgets apply if None)
+
+        Raises:
+            QuotaExceededError: If the call would exceed a budget or the endpoint is blocked
+        """
+        day, reset_in = _day_bounds()
+        keys = self._keys(day, endpoint, member)
+
+        def count(values: dict) -> dict:
+            self._verify(values, keys, reset_in)
+            return {counter: values.get(counter, 0) + 1 for counter, _, _, _ in keys}
+
+        try:
+            self.state_store.transact(
+                self.NAMESPACE, [key for entry in keys for key in entry[:2]], count, ttl=reset_in + 3600
+            )
+        except QuotaExceededError as e:
+            logger.warning(str(e))
+            raise
+
+    def block(self, endpoint: str, member: Optional[str], retry_after: float) -> None:
+        """Refuse calls to an endpoint for a while after LinkedIn throttled it.
+
+        Args:
+            endpoint: Name of the API endpoint
+            member: Member the throttled call was made for (the whole app is blocked if None)
+            retry_after: Seconds to refuse calls, capped at the end of the day
+        """
+        _, reset_in = _day_bounds()
+        retry_after = min(retry_after, reset_in)
+        scope = f"member:{member}" if member else "app"
+        logger.warning(f"LinkedIn throttled {endpoint} calls for {scope}, refusing them for {retry_after:.0f}s")
+        self.state_store.set(
+            self.NAMESPACE, f"blocked:{scope}:{endpoint}", time.time() + retry_after, ttl=retry_after
+        )
+
+    def report(self, member: Optional[str] = None) -> dict:
+        """Get today's usage and remaining budget for the app and a member.
+
+        Args:
+            member: Member to report on (only the app is reported if None)
+        """
+        day, reset_in = _day_bounds()
+        values = self.state_store.items(self.NAMESPACE)
+        scopes = {"app": self.app_limits}
+        if member:
+            scopes[f"member:{member}"] = self.member_limits
+
+        report = {"day": day, "resets_in_seconds": round(reset_in)}
+        for scope, limits in scopes.items():
+            prefix = f"{day}:{scope}:"
+            endpoints = set(limits) | {key[len(prefix):] for key in values if key.startswith(prefix)}
+            usage = {}
+            for name in sorted(endpoints):
+                used = int(values.get(prefix + name, 0))
+                limit = limits.get(name)
+                blocked_until = values.get(f"blocked:{scope}:{name}")
+                usage[name] = {
+                    "used": used,
+                    "limit": limit,
+                    "remaining": max(limit - used, 0) if limit is not None else None,
+                    "blocked_for_seconds": max(round(blocked_until - time.time()), 0) if blocked_until else None,
+                }
+            report["app" if scope == "app" else "member"] = usage
+        return report
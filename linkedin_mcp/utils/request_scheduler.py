@@ -0,0 +1,191 @@
+"""Priority scheduling of outbound requests with per-member fair queuing."""
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import AsyncIterator, Deque, Dict, Hashable, Iterator, Optional
+
+from .adaptive_limiter import AdaptiveLimiter, Sample
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request priority classes, most urgent first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+    MAINTENANCE = 2
+
+
+_priority: ContextVar[Priority] = ContextVar("request_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    """Get the priority requests made here are sent with."""
+    return _priority.get()
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Send requests made in this block, and in tasks created in it, at the given priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _Waiter:
+    """A request waiting for a slot."""
+
+    def __init__(self, priority: Priority, member: Hashable) -> None:
+        self.priority = priority
+        self.member = member
+        self.enqueued = time.monotonic()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class RequestScheduler:
+    """Hand out the slots of an adaptive limiter by priority and member.
+
+    Requests go straight through while the limiter has free slots. Once it's
+    saturated, each freed slot goes to the most urgent priority class with
+    waiting requests, and within a class to the members in turn, so one
+    member's batch can't hold up everyone else's calls. A lower-class request
+    that has waited longer than the starvation timeout is served ahead of
+    everything else.
+    """
+
+    def __init__(self, limiter: AdaptiveLimiter, starvation_timeout: float = 5.0) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            limiter: Limiter whose slots are scheduled
+            starvation_timeout: Seconds after which a background or maintenance request goes first
+        """
+        self.limiter = limiter
+        self.starvation_timeout = starvation_timeout
+        # Waiting requests per priority, by member in round-robin order
+        self._queues: Dict[Priority, "OrderedDict[Hashable, Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.served: Counter = Counter()
+        self.promoted: Counter = Counter()
+        self.max_wait: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+
+    def queued_for(self, priority: Priority) -> int:
+        """Get the number of requests of a priority waiting for a slot."""
+        return sum(len(queue) for queue in self._queues[priority].values())
+
+    @property
+    def queued(self) -> int:
+        """Get the number of requests waiting for a slot."""
+        return sum(self.queued_for(priority) for priority in Priority)
+
+    def _pop(self, priority: Priority, member: Hashable) -> _Waiter:
+        """Take a member's oldest request and move the member to the back of the round."""
+        members = self._queues[priority]
+        queue = members.pop(member)
+        waiter = queue.popleft()
+        if queue:
+            members[member] = queue
+        return waiter
+
+    def _remove(self, waiter: _Waiter) -> None:
+        """Drop a request that stopped waiting."""
+        members = self._queues[waiter.priority]
+        queue = members.get(waiter.member)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del members[waiter.member]
+
+    def _next(self) -> Optional[_Waiter]:
+        """Pick the request that gets the next free slot."""
+        now = time.monotonic()
+        starving = None
+        for priority in list(Priority)[1:]:
+            for queue in self._queues[priority].values():
+                head = queue[0]
+                if now - head.enqueued >= self.starvation_timeout and (
+                        starving is None or head.enqueued < starving.enqueued):
+                    starving = head
+        if starving:
+            self.promoted[starving.priority.name.lower()] += 1
+            return self._pop(starving.priority, starving.member)
+
+        for priority in Priority:
+            if self._queues[priority]:
+                return self._pop(priority, next(iter(self._queues[priority])))
+        return None
+
+    async def _dispatch(self) -> None:
+        """Give each slot the limiter frees to the next request until none wait."""
+        while self.queued:
+            await self.limiter.acquire()
+            holding = True
+            try:
+                while holding:
+                    waiter = self._next()
+                    if waiter is None:
+                        break
+                    if waiter.future.done():
+                        # Cancelled in the same loop turn the slot freed up
+                        continue
+                    wait = time.monotonic() - waiter.enqueued
+                    self.max_wait[waiter.priority] = max(self.max_wait[waiter.priority], wait)
+                    self.served[waiter.priority.name.lower()] += 1
+                    waiter.future.set_result(None)
+                    holding = False
+            finally:
+                if holding:
+                    self.limiter.release()
+
+    async def _admit(self, member: Hashable, priority: Priority) -> None:
+        """Wait until a limiter slot has been taken for the request."""
+        if not self.queued and not self.limiter.queued and self.limiter.has_capacity():
+            await self.limiter.acquire()
+            self.served[priority.name.lower()] += 1
+            return
+
+        waiter = _Waiter(priority, member)
+        self._queues[priority].setdefault(member, deque()).append(waiter)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Given a slot just before the cancellation arrived
+                self.limiter.release()
+            else:
+                self._remove(waiter)
+            raise
+
+    @asynccontextmanager
+    async def track(self, member: Hashable = None, priority: Optional[Priority] = None) -> AsyncIterator[Sample]:
+        """Wait for a slot by priority and member, then hold it like AdaptiveLimiter.track.
+
+        Args:
+            member: Key of the member the request is made for (None for anonymous requests)
+            priority: Priority class (the priority of the calling context if None)
+        """
+        await self._admit(member, current_priority() if priority is None else priority)
+        async with self.limiter.track(acquired=True) as sample:
+            yield sample
+
+    def snapshot(self) -> dict:
+        """Get queue lengths and per-class counters as metrics."""
+        return {
+            priority.name.lower(): {
+                "queued": self.queued_for(priority),
+                "served": self.served[priority.name.lower()],
+                "promoted": self.promoted[priority.name.lower()],
+                "max_wait_ms": round(self.max_wait[priority] * 1000, 1),
+            }
+            for priority in Priority
+        }
@@ -0,0 +1,99 @@
+"""Single-flight coalescing of identical in-flight requests."""
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def fingerprint(value: Any) -> Optional[str]:
+    """Get a short stable hash for a request body, token or other key part.
+
+    Args:
+        value: Bytes, string or JSON-serializable value (None is passed through)
+
+    Returns:
+        Hex digest prefix, or None if value is None
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.encode()
+    elif not isinstance(value, bytes):
+        value = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.sha256(value).hexdigest()[:16]
+
+
+def request_key(method: str, url: str, principal: Optional[str] = None, body: Any = None) -> tuple:
+    """Build a coalescing key from method, URL, principal and body hash.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        principal: Access token or other identity of the caller (hashed, never stored)
+        body: Request body or any value identifying the payload (hashed)
+    """
+    return method.upper(), str(url), fingerprint(principal), fingerprint(body)
+
+
+class _Call:
+    """A shared in-flight call and the number of callers waiting on it."""
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share one execution of an async call between concurrent identical callers.
+
+    The first caller for a key starts the call in its own task; callers arriving
+    while it is running await the same task and receive the same result or
+    exception. A cancelled caller only detaches itself - the shared call is
+    cancelled once no caller is left waiting for it.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn once for all concurrent callers using the same key.
+
+        Args:
+            key: Coalescing key, usually built with request_key()
+            fn: Zero-argument coroutine function performing the request
+
+        Returns:
+            The result of the shared call
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.create_task(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+        else:
+            logger.debug(f"Coalescing request into in-flight call: {key[:2] if isinstance(key, tuple) else key}")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                logger.debug("Last waiter cancelled, cancelling shared call")
+                self._forget(key, call)
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        """Drop a finished or abandoned call so later callers start a fresh one."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
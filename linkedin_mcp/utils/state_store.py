@@ -0,0 +1,164 @@
+"""Local state store shared between server worker processes."""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StateStore:
+    """Small SQLite-backed key/value store with optional expiry.
+
+    Values are stored as JSON under a namespace and key. SQLite in WAL mode
+    lets every worker process of an HTTP deployment read and update the same
+    file, so tokens, asset metadata and rate-limit counters survive restarts
+    and are visible to all workers.
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0) -> None:
+        """Initialize the store.
+
+        Args:
+            path: Path of the SQLite database file (created if missing)
+            timeout: Seconds to wait for a lock held by another process
+        """
+        self.path = path
+        self.timeout = timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this process' connection, opening it on first use."""
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            logger.debug(f"Opening state store: {self.path}")
+            conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Get a value, or default if it is missing or expired."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM kv WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return default
+        return json.loads(row[0])
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values with one query; missing and expired ones are left out."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT key, value FROM kv WHERE namespace = ? AND key IN ({', '.join('?' * len(keys))})"
+                " AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, *keys, time.time())
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value, optionally expiring after ttl seconds."""
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), expires_at)
+            )
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        """Get all unexpired values in a namespace."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT key, value FROM kv WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, time.time())
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def transact(
+            self,
+            namespace: str,
+            keys: Iterable[str],
+            update: Callable[[Dict[str, Any]], Dict[str, Any]],
+            ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Atomically read some values and write new ones across processes, in one transaction.
+
+        Args:
+            namespace: Namespace of the values
+            keys: Keys to read
+            update: Gets the current unexpired values of the keys and returns the values to
+                write; anything it raises aborts the transaction and is re-raised
+            ttl: Expiry of values that don't exist yet (existing values keep theirs)
+
+        Returns:
+            The values written
+        """
+        keys = list(keys)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    f"SELECT key, value, expires_at FROM kv WHERE namespace = ? AND key IN ({', '.join('?' * len(keys))})",
+                    (namespace, *keys)
+                ).fetchall() if keys else []
+                current = {key: (json.loads(value), expires_at) for key, value, expires_at in rows
+                           if expires_at is None or expires_at > now}
+                changes = update({key: value for key, (value, _) in current.items()})
+                conn.executemany(
+                    "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    [
+                        (namespace, key, json.dumps(value),
+                         current[key][1] if key in current else (now + ttl if ttl is not None else None))
+                        for key, value in changes.items()
+                    ]
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return changes
+
+    def purge_expired(self) -> int:
+        """Delete expired values.
+
+        Returns:
+            Number of values removed
+        """
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close this process' connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                logger.debug(f"Closing state store: {self.path}")
+                self._conn.close()
+            self._conn = None
+            self._pid = None
@@ -0,0 +1,125 @@
+"""Admission control for concurrent media uploads."""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from .request_scheduler import Priority, current_priority
+
+logger = logging.getLogger(__name__)
+
+
+class _Waiter:
+    """An upload waiting for admission."""
+
+    def __init__(self, size: int, priority: Priority) -> None:
+        self.size = size
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class UploadScheduler:
+    """Admit uploads against a byte budget and a connection budget.
+
+    An upload is admitted when a connection is free and its size fits in the
+    remaining byte budget; a file larger than the whole budget is admitted
+    alone. Waiting uploads are checked by priority class and within a class
+    smallest first, and any upload that fits may go ahead of one that
+    doesn't, so a post's image passes queued background videos. An upload
+    that has waited longer than the starvation timeout is checked before all
+    others, and nothing may pass it any more until it fits.
+    """
+
+    def __init__(self, max_bytes: int, max_connections: int, starvation_timeout: float = 30.0) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_bytes: Total size of uploads allowed in flight at once
+            max_connections: Number of uploads allowed in flight at once
+            starvation_timeout: Seconds after which a waiter goes first and blocks overtaking
+        """
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.starvation_timeout = starvation_timeout
+        self.inflight_bytes = 0
+        self.inflight_count = 0
+        self._waiters: List[_Waiter] = []
+
+    @property
+    def queued(self) -> int:
+        """Get the number of uploads waiting for admission."""
+        return len(self._waiters)
+
+    def _fits(self, size: int) -> bool:
+        """Check if an upload of this size can start now."""
+        if self.inflight_count >= self.max_connections:
+            return False
+        return self.inflight_count == 0 or self.inflight_bytes + size <= self.max_bytes
+
+    def _starving(self, waiter: _Waiter, now: float) -> bool:
+        """Check if an upload has waited longer than the starvation timeout."""
+        return now - waiter.enqueued >= self.starvation_timeout
+
+    def _dispatch(self) -> None:
+        """Admit every waiting upload that fits, starving ones first, then by priority and size."""
+        now = time.monotonic()
+        order = sorted(self._waiters, key=lambda waiter: (
+            (0, waiter.enqueued) if self._starving(waiter, now)
+            else (1, waiter.priority, waiter.size, waiter.enqueued)
+        ))
+        for waiter in order:
+            if waiter.future.done():
+                self._waiters.remove(waiter)
+                continue
+            if self._fits(waiter.size):
+                self._waiters.remove(waiter)
+                self._acquire(waiter.size)
+                waiter.future.set_result(None)
+            elif self._starving(waiter, now):
+                # Hold back everything behind a starving upload until it fits
+                break
+
+    def _acquire(self, size: int) -> None:
+        self.inflight_bytes += size
+        self.inflight_count += 1
+
+    def _release(self, size: int) -> None:
+        self.inflight_bytes -= size
+        self.inflight_count -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def admit(self, size: int, priority: Optional[Priority] = None) -> AsyncIterator[None]:
+        """Wait until an upload of size bytes may start and hold its share while it runs.
+
+        Args:
+            size: Size of the upload in bytes
+            priority: Priority class (the priority of the calling context if None)
+        """
+        if not self._waiters and self._fits(size):
+            self._acquire(size)
+        else:
+            waiter = _Waiter(size, current_priority() if priority is None else priority)
+            self._waiters.append(waiter)
+            self._dispatch()
+            logger.debug(
+                f"Upload of {size} bytes queued behind {len(self._waiters) - 1} others "
+                f"({self.inflight_count} uploads, {self.inflight_bytes} bytes in flight)"
+            )
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    # Admitted just before the cancellation arrived
+                    self._release(size)
+                elif waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    self._dispatch()
+                raise
+            logger.debug(f"Upload of {size} bytes admitted after {time.monotonic() - waiter.enqueued:.2f}s")
+        try:
+            yield
+        finally:
+            self._release(size)
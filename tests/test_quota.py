@@ -0,0 +1,71 @@
+"""Tests for daily quota accounting."""
+import threading
+
+import pytest
+
+from linkedin_mcp.utils.quota import QuotaExceededError, QuotaLedger
+from linkedin_mcp.utils.state_store import StateStore
+
+
+def test_concurrent_reservations_stay_within_budget(tmp_path):
+    path = str(tmp_path / "state.db")
+    # One store per "worker", each with its own SQLite connection
+    ledgers = [QuotaLedger(StateStore(path), app_limits={"ugcPosts": 5}) for _ in range(4)]
+    admitted, refused = [], []
+    start = threading.Barrier(40)
+
+    def reserve(ledger):
+        start.wait()
+        try:
+            ledger.reserve("ugcPosts", "member")
+            admitted.append(True)
+        except QuotaExceededError:
+            refused.append(True)
+
+    threads = [threading.Thread(target=reserve, args=(ledgers[i % 4],)) for i in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(admitted) == 5
+    assert len(refused) == 35
+    assert ledgers[0].report("member")["app"]["ugcPosts"]["used"] == 5
+
+
+def test_member_budget_is_kept_per_member(tmp_path):
+    ledger = QuotaLedger(StateStore(str(tmp_path / "state.db")), member_limits={"*": 2})
+    ledger.reserve("ugcPosts", "alice")
+    ledger.reserve("assets", "alice")
+    with pytest.raises(QuotaExceededError):
+        ledger.reserve("ugcPosts", "alice")
+    ledger.reserve("ugcPosts", "bob")
+
+
+def test_check_does_not_count(tmp_path):
+    ledger = QuotaLedger(StateStore(str(tmp_path / "state.db")), app_limits={"ugcPosts": 1})
+    ledger.check("ugcPosts")
+    ledger.check("ugcPosts")
+    ledger.reserve("ugcPosts")
+    with pytest.raises(QuotaExceededError):
+        ledger.check("ugcPosts")
+
+
+def test_refused_reservation_is_not_counted(tmp_path):
+    ledger = QuotaLedger(
+        StateStore(str(tmp_path / "state.db")), app_limits={"ugcPosts": 10}, member_limits={"ugcPosts": 1}
+    )
+    ledger.reserve("ugcPosts", "alice")
+    with pytest.raises(QuotaExceededError):
+        ledger.reserve("ugcPosts", "alice")
+    assert ledger.report()["app"]["ugcPosts"]["used"] == 1
+
+
+def test_blocked_endpoint_is_refused(tmp_path):
+    ledger = QuotaLedger(StateStore(str(tmp_path / "state.db")))
+    ledger.block("assets", "alice", retry_after=60)
+    with pytest.raises(QuotaExceededError) as error:
+        ledger.reserve("assets", "alice")
+    assert 0 < error.value.retry_after <= 60
+    ledger.reserve("assets", "bob")
+    ledger.reserve("ugcPosts", "alice")
@@ -0,0 +1,117 @@
+"""Tests for priority and fair-queuing request scheduling."""
+import asyncio
+
+from linkedin_mcp.utils.adaptive_limiter import AdaptiveLimiter
+from linkedin_mcp.utils.request_scheduler import Priority, RequestScheduler
+
+
+def _scheduler(starvation_timeout: float = 5.0) -> RequestScheduler:
+    """Create a scheduler over a limiter with a single fixed slot."""
+    limiter = AdaptiveLimiter("test", initial_limit=1, max_limit=1, latency_tolerance=None)
+    return RequestScheduler(limiter, starvation_timeout=starvation_timeout)
+
+
+async def _hold(scheduler: RequestScheduler):
+    """Take the only slot until the returned event is set."""
+    release = asyncio.Event()
+
+    async def holder():
+        async with scheduler.track("holder", Priority.INTERACTIVE):
+            await release.wait()
+
+    task = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    return release, task
+
+
+async def _enqueue(scheduler: RequestScheduler, requests: list, served: list) -> list:
+    """Queue (name, member, priority) requests in order; each appends its name to served once admitted."""
+    async def request(name, member, priority):
+        async with scheduler.track(member, priority):
+            served.append(name)
+
+    tasks = []
+    for name, member, priority in requests:
+        tasks.append(asyncio.create_task(request(name, member, priority)))
+        await asyncio.sleep(0)
+    return tasks
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    async def main():
+        scheduler = _scheduler()
+        tasks = {}
+
+        async def request():
+            async with scheduler.track("b", Priority.INTERACTIVE):
+                pass
+
+        async def holder():
+            async with scheduler.track("a", Priority.INTERACTIVE):
+                await asyncio.sleep(0.01)
+            # Cancelled in the same loop turn the slot is freed
+            tasks["waiter"].cancel()
+
+        holding = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        tasks["waiter"] = asyncio.create_task(request())
+        await asyncio.gather(holding, tasks["waiter"], return_exceptions=True)
+        await asyncio.sleep(0.01)
+
+        assert scheduler.limiter.inflight == 0
+        assert scheduler.queued == 0
+        await asyncio.wait_for(request(), 1)
+
+    asyncio.run(main())
+
+
+def test_interactive_requests_go_first():
+    async def main():
+        scheduler = _scheduler()
+        served = []
+        release, holder = await _hold(scheduler)
+        tasks = await _enqueue(scheduler, [
+            ("background", "a", Priority.BACKGROUND),
+            ("maintenance", "a", Priority.MAINTENANCE),
+            ("interactive", "a", Priority.INTERACTIVE),
+        ], served)
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        assert served == ["interactive", "background", "maintenance"]
+
+    asyncio.run(main())
+
+
+def test_starved_request_is_promoted():
+    async def main():
+        scheduler = _scheduler(starvation_timeout=0.05)
+        served = []
+        release, holder = await _hold(scheduler)
+        tasks = await _enqueue(scheduler, [("background", "a", Priority.BACKGROUND)], served)
+        await asyncio.sleep(0.06)
+        tasks += await _enqueue(scheduler, [("interactive", "b", Priority.INTERACTIVE)], served)
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        assert served[0] == "background"
+        assert scheduler.promoted["background"] == 1
+
+    asyncio.run(main())
+
+
+def test_members_take_turns():
+    async def main():
+        scheduler = _scheduler()
+        served = []
+        release, holder = await _hold(scheduler)
+        tasks = await _enqueue(scheduler, [
+            ("a1", "a", Priority.INTERACTIVE),
+            ("a2", "a", Priority.INTERACTIVE),
+            ("a3", "a", Priority.INTERACTIVE),
+            ("b1", "b", Priority.INTERACTIVE),
+            ("b2", "b", Priority.INTERACTIVE),
+        ], served)
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        assert served == ["a1", "b1", "a2", "b2", "a3"]
+
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""Tests for single-flight coalescing of identical requests."""
+import asyncio
+
+import pytest
+
+from linkedin_mcp.utils.singleflight import SingleFlight, request_key
+
+
+def test_concurrent_callers_share_one_call():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert len(flight) == 0
+
+    asyncio.run(main())
+
+
+def test_callers_share_the_exception():
+    async def main():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(flight) == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_caller_detaches_without_cancelling_the_call():
+    async def main():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == "result"
+
+    asyncio.run(main())
+
+
+def test_last_cancelled_caller_cancels_the_call():
+    async def main():
+        flight = SingleFlight()
+        started, cancelled = 0, 0
+
+        async def fetch():
+            nonlocal started, cancelled
+            started += 1
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+            return "result"
+
+        caller = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        assert cancelled == 1
+        assert len(flight) == 0
+
+        async def quick():
+            nonlocal started
+            started += 1
+            return "fresh"
+
+        assert await flight.do("key", quick) == "fresh"
+        assert started == 2
+
+    asyncio.run(main())
+
+
+def test_request_key_separates_principals_and_bodies():
+    key = request_key("get", "https://api.linkedin.com/v2/userinfo", principal="token-a")
+    assert key == request_key("GET", "https://api.linkedin.com/v2/userinfo", principal="token-a")
+    assert key != request_key("GET", "https://api.linkedin.com/v2/userinfo", principal="token-b")
+    assert request_key("POST", "u", body={"a": 1, "b": 2}) == request_key("POST", "u", body={"b": 2, "a": 1})
+    assert "token-a" not in repr(key)
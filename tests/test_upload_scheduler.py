@@ -0,0 +1,128 @@
+"""Tests for media upload admission control."""
+import asyncio
+
+import pytest
+
+from linkedin_mcp.utils.request_scheduler import Priority
+from linkedin_mcp.utils.upload_scheduler import UploadScheduler
+
+
+async def _upload(scheduler: UploadScheduler, name: str, size: int, admitted: list, release: asyncio.Event,
+                  priority: Priority = Priority.INTERACTIVE):
+    """Hold an admitted upload of size bytes until release is set, recording its admission."""
+    async with scheduler.admit(size, priority):
+        admitted.append(name)
+        await release.wait()
+
+
+async def _start(*coros) -> list:
+    """Start uploads in order, letting each queue before the next."""
+    tasks = []
+    for coro in coros:
+        tasks.append(asyncio.create_task(coro))
+        await asyncio.sleep(0)
+    return tasks
+
+
+def test_connection_budget():
+    async def main():
+        scheduler = UploadScheduler(max_bytes=1000, max_connections=2)
+        admitted, release = [], asyncio.Event()
+        tasks = await _start(*(_upload(scheduler, f"u{i}", 10, admitted, release) for i in range(3)))
+        assert admitted == ["u0", "u1"]
+        assert scheduler.queued == 1
+        release.set()
+        await asyncio.gather(*tasks)
+        assert admitted == ["u0", "u1", "u2"]
+        assert scheduler.inflight_count == 0 and scheduler.inflight_bytes == 0
+
+    asyncio.run(main())
+
+
+def test_small_upload_passes_one_over_the_byte_budget():
+    async def main():
+        scheduler = UploadScheduler(max_bytes=100, max_connections=4)
+        admitted, release = [], asyncio.Event()
+        tasks = await _start(
+            _upload(scheduler, "video1", 80, admitted, release),
+            _upload(scheduler, "video2", 80, admitted, release),
+            _upload(scheduler, "image", 10, admitted, release),
+        )
+        assert admitted == ["video1", "image"]
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+
+def test_upload_larger_than_budget_runs_alone():
+    async def main():
+        scheduler = UploadScheduler(max_bytes=100, max_connections=4)
+        admitted, release = [], asyncio.Event()
+        tasks = await _start(
+            _upload(scheduler, "huge", 500, admitted, release),
+            _upload(scheduler, "image", 10, admitted, release),
+        )
+        assert admitted == ["huge"]
+        release.set()
+        await asyncio.gather(*tasks)
+        assert admitted == ["huge", "image"]
+
+    asyncio.run(main())
+
+
+def test_starving_upload_blocks_overtaking():
+    async def main():
+        scheduler = UploadScheduler(max_bytes=100, max_connections=4, starvation_timeout=0.02)
+        admitted = []
+        first, rest = asyncio.Event(), asyncio.Event()
+        tasks = await _start(
+            _upload(scheduler, "video1", 60, admitted, first),
+            _upload(scheduler, "video2", 60, admitted, rest),
+        )
+        await asyncio.sleep(0.03)
+        tasks += await _start(_upload(scheduler, "image", 10, admitted, rest))
+        # video2 is starving and doesn't fit yet, so the image may not pass it
+        assert admitted == ["video1"]
+        first.set()
+        rest.set()
+        await asyncio.gather(*tasks)
+        assert admitted == ["video1", "video2", "image"]
+
+    asyncio.run(main())
+
+
+def test_interactive_uploads_go_before_background_ones():
+    async def main():
+        scheduler = UploadScheduler(max_bytes=1000, max_connections=1)
+        admitted, release = [], asyncio.Event()
+        tasks = await _start(
+            _upload(scheduler, "running", 10, admitted, release, Priority.BACKGROUND),
+            _upload(scheduler, "background", 10, admitted, release, Priority.BACKGROUND),
+            _upload(scheduler, "interactive", 50, admitted, release, Priority.INTERACTIVE),
+        )
+        release.set()
+        await asyncio.gather(*tasks)
+        assert admitted == ["running", "interactive", "background"]
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_leaves_the_budget_alone():
+    async def main():
+        scheduler = UploadScheduler(max_bytes=1000, max_connections=1)
+        admitted, release = [], asyncio.Event()
+        tasks = await _start(
+            _upload(scheduler, "running", 10, admitted, release),
+            _upload(scheduler, "waiting", 10, admitted, release),
+        )
+        tasks[1].cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await tasks[1]
+        assert scheduler.queued == 0
+        release.set()
+        await tasks[0]
+        assert admitted == ["running"]
+        assert scheduler.inflight_count == 0 and scheduler.inflight_bytes == 0
+
+    asyncio.run(main())